@@ -0,0 +1,49 @@
+"""
+Chameleon Regex Engine — Batch Benchmark
+----------------------------------------
+
+Compares the NumPy batch executor with a loop calling `Pattern.match` once per record,
+on random fixed-format records (i.e. two letters followed by six digits), at different batch sizes
+
+Usage:
+    python -m benchmarks.batch_benchmark [<max_batch_size>]
+
+Requires NumPy
+"""
+import random
+import sys
+import time
+
+from core.batch import BatchMatcher
+from core.regex import Regex
+
+DIGIT = '(0|1|2|3|4|5|6|7|8|9)'
+PATTERN = f'(A|B|C)(A|B|C){DIGIT * 6}'
+
+max_batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+random.seed(0)
+pattern = Regex.compile(PATTERN, engine='dfa')
+batch = BatchMatcher(pattern)
+
+print(f"Pattern: {PATTERN}")
+print(f"{'Batch size':>12} {'Loop (rec/s)':>14} {'Batch (rec/s)':>14} {'Speedup':>8}")
+size = 100
+while size <= max_batch_size:
+    # Most records are valid, some have a wrong character or a wrong length
+    records = [
+        random.choice('ABC') + random.choice('ABCD') + ''.join(random.choice('0123456789') for _ in range(random.choice((5, 6, 6, 6))))
+        for _ in range(size)
+    ]
+
+    start = time.perf_counter()
+    expected = [pattern.match(r) for r in records]
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = batch.match(records)
+    vectorized = time.perf_counter() - start
+
+    assert result.tolist() == expected, "Batch executor and loop disagree"
+    print(f"{size:>12} {size / loop:>14.0f} {size / vectorized:>14.0f} {loop / vectorized:>7.1f}x")
+    size *= 10
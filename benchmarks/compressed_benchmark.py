@@ -0,0 +1,78 @@
+"""
+Chameleon Regex Engine — Compressed Table Benchmark
+---------------------------------------------------
+
+Builds a large DFA (i.e. a set of keywords over the lowercase letters), then reports the memory footprint
+and the lookup speed of the dictionaries, a dense table and the compressed table
+
+Usage:
+    python -m benchmarks.compressed_benchmark [<number_of_keywords>]
+"""
+import random
+import sys
+import time
+from array import array
+
+from core.compressed import CompressedTable
+from core.regex import Regex
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+random.seed(0)
+keywords = sorted({''.join(random.choice(LETTERS) for _ in range(random.randint(3, 10))) for _ in range(count)})
+regex = '(' + '|'.join(keywords) + ')(_(' + '|'.join(LETTERS) + ')*)*'
+
+start = time.perf_counter()
+pattern = Regex.compile(regex, engine='dfa')
+compile_time = time.perf_counter() - start
+
+start = time.perf_counter()
+compressed = CompressedTable(pattern)
+compress_time = time.perf_counter() - start
+
+# Dense table of 32-bit integers, one flat array
+symbols, table = pattern.dense_table()
+symbol_index = {s: i for i, s in enumerate(symbols)}
+dense = array('i', (target for row in table for target in row))
+width = len(symbols)
+dead_state = len(table) - 1
+
+
+def match_dense(literal: str) -> bool:
+    """
+    Reference loop over the dense table
+
+    :param literal: A text
+    :return True if the literal match the pattern
+    """
+    state = pattern.init_state
+    for c in literal:
+        i = symbol_index.get(c)
+        if i is None:
+            return False
+
+        state = dense[state * width + i]
+        if state == dead_state:
+            return False
+
+    return state in pattern.final_states
+
+
+texts = [random.choice(keywords) + '_' + ''.join(random.choice(LETTERS) for _ in range(random.randint(0, 20))) for _ in range(20000)]
+texts += [''.join(random.choice(LETTERS) for _ in range(8)) for _ in range(5000)]
+characters = sum(map(len, texts))
+
+print(f"Keywords: {len(keywords)}  Compile: {compile_time:.2f}s  Compress: {compress_time:.2f}s")
+for name, value in compressed.footprint().items():
+    print(f"{name:>18}: {value}")
+
+print(f"{'Lookup':>18}  {'Mchar/s':>8}")
+for name, match in (('dictionary', pattern.match), ('dense', match_dense), ('compressed', compressed.match)):
+    start = time.perf_counter()
+    results = [match(t) for t in texts]
+    elapsed = time.perf_counter() - start
+
+    assert results == [pattern.match(t) for t in texts], f"{name} disagrees with the dictionary"
+    print(f"{name:>18}  {characters / elapsed / 1e6:>8.2f}")
@@ -0,0 +1,60 @@
+"""
+Chameleon Regex Engine — Optimizer Report
+-----------------------------------------
+
+Reports the size of the AST, the Thompson automaton (epsilon-NFA) and the DFA
+for each pattern, without and with the AST optimizer
+
+Usage:
+    python -m benchmarks.optimizer_report <patterns_file>
+    python -m benchmarks.optimizer_report -e <pattern> [<pattern> ...]
+
+Arguments:
+    patterns_file : str
+        File with one pattern per line (i.e. the rule corpus)
+"""
+import sys
+
+from core.lexer.lexer import Lexer
+from core.optimizer.optimizer import Optimizer
+from core.parser.parser import Parser
+from core.regex import Regex
+
+
+def sizes(pattern: str, optimize: bool) -> tuple:
+    """
+    Size of the automata built for a pattern
+
+    :param pattern: Pattern
+    :param optimize: Use the optimizer or not
+    :return (epsilon-NFA states, reachable DFA states)
+    """
+    automaton = Regex.construct_eNFA(pattern, optimize=optimize)
+    nfa_states = len(automaton.states)
+    dfa_states = len(automaton.NFA_to_DFA().reachable_states())
+
+    return nfa_states, dfa_states
+
+
+if len(sys.argv) < 2:
+    print("Usage: python -m benchmarks.optimizer_report <patterns_file> | -e <pattern> ...")
+    sys.exit(1)
+
+if sys.argv[1] == '-e':
+    patterns = sys.argv[2:]
+else:
+    with open(sys.argv[1], encoding='utf-8') as f:
+        patterns = [line.rstrip('\n') for line in f if line.strip() != '']
+
+totals = [0] * 6
+print(f"{'AST':>11} {'eNFA':>11} {'DFA':>11}  Pattern")
+for pattern in patterns:
+    report = Optimizer.report(Parser.parse(Lexer.tokenize(pattern)))
+    nfa_before, dfa_before = sizes(pattern, False)
+    nfa_after, dfa_after = sizes(pattern, True)
+    row = (report['nodes_before'], report['nodes_after'], nfa_before, nfa_after, dfa_before, dfa_after)
+    totals = [t + r for t, r in zip(totals, row)]
+    print(f"{row[0]:>5}>{row[1]:<5} {row[2]:>5}>{row[3]:<5} {row[4]:>5}>{row[5]:<5}  {pattern}")
+
+print("-" * 40)
+print(f"{totals[0]:>5}>{totals[1]:<5} {totals[2]:>5}>{totals[3]:<5} {totals[4]:>5}>{totals[5]:<5}  Total ({len(patterns)} patterns)")
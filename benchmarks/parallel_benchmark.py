@@ -0,0 +1,41 @@
+"""
+Chameleon Regex Engine — Parallel Benchmark
+-------------------------------------------
+
+Matches one big text with 1, 2, 4, ... worker processes and compares with the sequential `Pattern.match`
+
+Usage:
+    python -m benchmarks.parallel_benchmark [<size_in_MiB>]
+"""
+import os
+import random
+import sys
+import time
+
+from core.parallel import ParallelMatcher
+from core.regex import Regex
+
+PATTERN = '((a|b)(a|b)|c)*'
+
+size = int(sys.argv[1]) * (1 << 20) if len(sys.argv) > 1 else 64 << 20
+
+random.seed(0)
+pattern = Regex.compile(PATTERN, engine='dfa')
+text = ''.join(random.choice(('ab', 'ba', 'c', 'aa')) for _ in range(size // 2))
+
+start = time.perf_counter()
+expected = pattern.match(text)
+sequential = time.perf_counter() - start
+
+print(f"Pattern: {PATTERN}  Text: {len(text) / (1 << 20):.1f} MiB  CPUs: {os.cpu_count()}")
+print(f"{'Workers':>8} {'Time (s)':>10} {'MiB/s':>8} {'Speedup':>8}")
+print(f"{'seq':>8} {sequential:>10.3f} {len(text) / sequential / (1 << 20):>8.2f} {1:>7.1f}x")
+workers = 1
+while workers <= (os.cpu_count() or 1):
+    start = time.perf_counter()
+    result = ParallelMatcher(pattern, workers=workers).match(text)
+    elapsed = time.perf_counter() - start
+
+    assert result == expected, "Parallel and sequential scans disagree"
+    print(f"{workers:>8} {elapsed:>10.3f} {len(text) / elapsed / (1 << 20):>8.2f} {sequential / elapsed:>7.1f}x")
+    workers *= 2
@@ -0,0 +1,58 @@
+"""
+Chameleon Regex Engine — Scanner Benchmark
+------------------------------------------
+
+Measures the throughput of a scanner generated for a log format (i.e. `date time level message`)
+
+Usage:
+    python -m benchmarks.scanner_benchmark [<size_in_MiB>]
+"""
+import random
+import sys
+import time
+
+from core.scanner import Scanner
+
+DIGIT = '(0|1|2|3|4|5|6|7|8|9)'
+LETTER = '(' + '|'.join('abcdefghijklmnopqrstuvwxyz') + ')'
+RULES = [
+    ('LEVEL', 'INFO|WARN|ERROR'),
+    ('DATE', f'{DIGIT * 4}-{DIGIT * 2}-{DIGIT * 2}'),
+    ('TIME', f'{DIGIT * 2}:{DIGIT * 2}:{DIGIT * 2}'),
+    ('NUMBER', f'{DIGIT}{DIGIT}*'),
+    ('WORD', f'{LETTER}{LETTER}*'),
+    ('SPACE', '  *'),
+    ('PUNCT', '=|,|.|:|-'),
+    ('NEWLINE', '\n'),
+]
+
+size = int(sys.argv[1]) * (1 << 20) if len(sys.argv) > 1 else 4 << 20
+
+random.seed(0)
+lines = []
+length = 0
+while length < size:
+    words = ' '.join(''.join(random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(random.randint(2, 9))) for _ in range(6))
+    line = f"2024-{random.randint(1, 12):02}-{random.randint(1, 28):02} {random.randint(0, 23):02}:13:37 " \
+           f"{random.choice(('INFO', 'WARN', 'ERROR'))} {words} id={random.randint(0, 99999)}, took {random.randint(0, 999)}.5\n"
+    lines.append(line)
+    length += len(line)
+text = ''.join(lines)
+
+start = time.perf_counter()
+scanner = Scanner(RULES)
+build = time.perf_counter() - start
+
+start = time.perf_counter()
+tokens = sum(1 for _ in scanner.tokenize(text))
+elapsed = time.perf_counter() - start
+
+start = time.perf_counter()
+streamed = sum(1 for _ in scanner.tokenize_stream(text[i:i + 65536] for i in range(0, len(text), 65536)))
+elapsed_stream = time.perf_counter() - start
+
+assert streamed == tokens, "Streamed and whole-text tokenization disagree"
+print(f"Rules: {len(RULES)}  DFA states: {len(scanner.accepting)}  Build: {build:.3f}s")
+print(f"Text: {len(text) / (1 << 20):.1f} MiB  Tokens: {tokens}")
+print(f"Whole text: {len(text) / elapsed / (1 << 20):.2f} MiB/s  {tokens / elapsed:.0f} tokens/s")
+print(f"Streamed:   {len(text) / elapsed_stream / (1 << 20):.2f} MiB/s  {tokens / elapsed_stream:.0f} tokens/s")
@@ -7,31 +7,113 @@ the Chameleon regex engine directly from the command line
 
 Usage:
     python chameleon.py <pattern> <text>
+    python chameleon.py grep [-s] [-c] [-l] [-n] [-j JOBS] [--stats] <pattern> <path> [<path> ...]
+    python chameleon.py serve [--unix PATH | --host HOST --port PORT] [--cache-size N] [--max-states N] [--max-seconds S] [--compile-workers N]
 
 Arguments:
     pattern : str
         The regular expression pattern you want to match
     text : str
         The string to test against the regex pattern
+    path : str
+        File or directory (scanned recursively) to test line by line against the regex pattern
 """
+import argparse
+import asyncio
+import os
 import sys
+
+from core.daemon.server import MatchServer
+from core.grep import Grep
+from core.limits import CompileLimits
 from core.regex import Regex
 
-# Validate command-line input
-if len(sys.argv) < 3:
-    print("Usage: python chameleon.py <pattern> <text>")
-    sys.exit(1)
 
-pattern = sys.argv[1] # First argument: regex pattern
-text = sys.argv[2] # Second argument: string to match
+def grep(argv: list) -> int:
+    """
+    Grep mode, scans files line by line
+
+    :param argv: Command-line arguments after `grep`
+    :return Exit status
+    """
+    parser = argparse.ArgumentParser(prog="chameleon.py grep", description="Print the lines matching the pattern")
+    parser.add_argument("pattern", help="regular expression pattern")
+    parser.add_argument("paths", nargs="+", help="files or directories to scan")
+    parser.add_argument("-s", "--search", action="store_true", help="select lines containing a match instead of whole-line matches")
+    parser.add_argument("-c", "--count", action="store_true", help="print only the number of matching lines per file")
+    parser.add_argument("-l", "--files-with-matches", action="store_true", help="print only the names of files with a match")
+    parser.add_argument("-n", "--line-number", action="store_true", help="prefix each line with its line number")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of worker processes (default: all cores)")
+    parser.add_argument("--stats", action="store_true", help="print the throughput on the standard error")
+    args = parser.parse_args(argv)
+
+    # Compile once up front, so a broken pattern is reported before any worker starts
+    try:
+        Regex.compile(args.pattern)
+    except Exception as e: # SyntaxError, or the parser's error for an empty pattern
+        print(f"chameleon: {e}", file=sys.stderr)
+        return 2
+
+    options = {
+        'search': args.search,
+        'count': args.count,
+        'files_with_matches': args.files_with_matches,
+        'line_numbers': args.line_number,
+    }
+
+    return Grep.run(args.pattern, args.paths, options, jobs=max(1, args.jobs), stats=args.stats)
+
+
+def serve(argv: list) -> int:
+    """
+    Daemon mode, answers match/search requests with the compiled patterns kept in cache
+
+    :param argv: Command-line arguments after `serve`
+    :return Exit status
+    """
+    parser = argparse.ArgumentParser(prog="chameleon.py serve", description="Run the matching daemon")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=7878, help="TCP port (default: 7878)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="number of compiled patterns kept (default: 1024)")
+    parser.add_argument("--max-states", type=int, default=100000, help="reject patterns whose automaton exceeds this number of states (default: 100000)")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="abort compilations longer than this (default: 2)")
+    parser.add_argument("--compile-workers", type=int, default=1, help="number of worker processes compiling new patterns (default: 1)")
+    args = parser.parse_args(argv)
+
+    limits = CompileLimits(max_states=args.max_states, max_seconds=args.max_seconds)
+    try:
+        asyncio.run(MatchServer(cache_size=args.cache_size, limits=limits, compile_workers=max(1, args.compile_workers)).serve(path=args.unix, host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'grep':
+        sys.exit(grep(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        sys.exit(serve(sys.argv[2:]))
+
+    # Validate command-line input
+    if len(sys.argv) < 3:
+        print("Usage: python chameleon.py <pattern> <text>")
+        print("       python chameleon.py grep [options] <pattern> <path> [<path> ...]")
+        print("       python chameleon.py serve [options]")
+        sys.exit(1)
+
+    pattern = sys.argv[1] # First argument: regex pattern
+    text = sys.argv[2] # Second argument: string to match
 
-# Run regex matching
-truth = Regex.match(text, pattern)
+    # Run regex matching
+    truth = Regex.match(text, pattern)
 
-# Display results
-print("Chameleon Regex Engine — CLI Mode\n")
-print(f"Pattern: {pattern}")
-print(f"Text: {text}")
-print("-" * 40)
-print("Match!" if truth else "No match")
-print("-" * 40)
\ No newline at end of file
+    # Display results
+    print("Chameleon Regex Engine — CLI Mode\n")
+    print(f"Pattern: {pattern}")
+    print(f"Text: {text}")
+    print("-" * 40)
+    print("Match!" if truth else "No match")
+    print("-" * 40)
@@ -0,0 +1,191 @@
+from core.bitparallel import BitParallelPattern
+from core.lexer.tokens import TokenType
+from core.limits import CompileLimitExceeded, CompileLimits
+from core.parser.tree.concat_node import ConcatNode
+from core.parser.tree.kleen_node import KleeneNode
+from core.parser.tree.literal_node import LiteralNode
+from core.parser.tree.pipe_node import PipeNode
+
+
+class CostAnalyzer:
+    """
+    CostAnalyzer estimates the cost of compiling a pattern before any automaton is built
+
+    Estimates:
+        (1) From the tokens: an upper bound of the Thompson automaton (i.e. 2 states per literal, star and pipe)
+        (2) From the AST: the exact size of the Thompson automaton built from it
+        (3) From the AST: the worst-case size of the DFA, a star followed by a marker (i.e. a factor starting with
+            only some of the star's symbols, like the `a` of (a|b)*a(a|b)(a|b)) and then k ambiguous factors
+            sharing its symbols forces the DFA to remember where the marker may have been, so about 2^(k+1) states,
+            and never more than 2^positions states. A factor is ambiguous when it is a star or can start with
+            more than one position. A literal tail (e.g. (a|b)*abc) or a tail repeating the star without marker
+            (e.g. (a|b)*(a|b)(a|b)) only adds one state per factor
+    """
+    @staticmethod
+    def estimate(tokens: list, ast) -> dict:
+        """
+        Estimate the size of the automata of a pattern
+
+        :param tokens: List of tokens (see `Lexer.tokenize`)
+        :param ast: Abstract Syntax Tree of the pattern (see `Regex.parse`)
+        :return Dictionary of estimates
+        """
+        operators = sum(1 for t in tokens if t.type in (TokenType.T_LITERAL, TokenType.T_KLEENE_CLOSURE, TokenType.T_PIPE))
+        nfa_states, nfa_transitions = CostAnalyzer.__thompson_size(ast)
+        positions = BitParallelPattern.count_positions(ast)
+        alphabet = CostAnalyzer.__alphabet(ast)
+        tail = CostAnalyzer.__ambiguous_tail(ast)
+
+        dfa_states = min(2 ** positions + 1, positions + 1 + 2 ** tail)
+        dfa_transitions = dfa_states * len(alphabet)
+
+        return {
+            'tokens': len(tokens),
+            'nfa_states_bound': 2 * operators,
+            'nfa_states': nfa_states,
+            'nfa_transitions': nfa_transitions,
+            'positions': positions,
+            'alphabet': len(alphabet),
+            'ambiguous_tail': tail,
+            'dfa_states': dfa_states,
+            'dfa_transitions': dfa_transitions,
+            'memory': dfa_states * CompileLimits.BYTES_PER_STATE + dfa_transitions * CompileLimits.BYTES_PER_TRANSITION,
+        }
+
+    @staticmethod
+    def admit(estimate: dict, limits: CompileLimits) -> None:
+        """
+        Reject a pattern whose estimated automata exceed the limits
+
+        :param estimate: Estimates (see `estimate`)
+        :param limits: Compile limits
+        :return None
+        :raise CompileLimitExceeded in case an estimate exceeds a limit
+        """
+        checks = [
+            ('estimated nfa_states', estimate['nfa_states'], limits.max_states),
+            ('estimated dfa_states', estimate['dfa_states'], limits.max_states),
+            ('estimated nfa_transitions', estimate['nfa_transitions'], limits.max_transitions),
+            ('estimated dfa_transitions', estimate['dfa_transitions'], limits.max_transitions),
+            ('estimated memory', estimate['memory'], limits.max_memory),
+        ]
+        for limit, value, maximum in checks:
+            if maximum is not None and value > maximum:
+                raise CompileLimitExceeded(limit, value, maximum)
+
+    @staticmethod
+    def __thompson_size(node) -> tuple:
+        """
+        Size of the Thompson automaton built by `Regex` for a node
+
+        :param node: Node of the tree
+        :return (states, transitions) where transitions counts the (state, symbol) keys
+        """
+        if isinstance(node, LiteralNode):
+            return 2, 1
+        elif isinstance(node, KleeneNode):
+            states, transitions = CostAnalyzer.__thompson_size(node.literal)
+            return states + 2, transitions + 2
+        elif isinstance(node, ConcatNode):
+            left, right = CostAnalyzer.__thompson_size(node.left), CostAnalyzer.__thompson_size(node.right)
+            return left[0] + right[0], left[1] + right[1] + 1
+        elif isinstance(node, PipeNode):
+            left, right = CostAnalyzer.__thompson_size(node.left), CostAnalyzer.__thompson_size(node.right)
+            return left[0] + right[0] + 2, left[1] + right[1] + 3
+
+        raise Exception(f'Unknown AST node {node}')
+
+    @staticmethod
+    def __alphabet(node) -> set:
+        """
+        Symbols of a node
+
+        :param node: Node of the tree
+        :return Set of symbols
+        """
+        if isinstance(node, LiteralNode):
+            return {node.literal}
+        elif isinstance(node, KleeneNode):
+            return CostAnalyzer.__alphabet(node.literal)
+
+        return CostAnalyzer.__alphabet(node.left) | CostAnalyzer.__alphabet(node.right)
+
+    @staticmethod
+    def __ambiguous_tail(node) -> int:
+        """
+        Longest run of ambiguous factors that follow a star and a marker in a concatenation, and share symbols with the star
+
+        :param node: Node of the tree
+        :return Length of the longest run
+        """
+        if isinstance(node, LiteralNode):
+            return 0
+        elif isinstance(node, KleeneNode):
+            return CostAnalyzer.__ambiguous_tail(node.literal)
+        elif isinstance(node, PipeNode):
+            return max(CostAnalyzer.__ambiguous_tail(node.left), CostAnalyzer.__ambiguous_tail(node.right))
+
+        factors = []
+        while isinstance(node, ConcatNode):
+            factors.append(node.left)
+            node = node.right
+        factors.append(node)
+
+        longest = max(CostAnalyzer.__ambiguous_tail(f) for f in factors)
+        for i, factor in enumerate(factors):
+            if not isinstance(factor, KleeneNode):
+                continue
+
+            symbols = CostAnalyzer.__alphabet(factor)
+            marked = False
+            run = 0
+            for f in factors[i + 1:]:
+                if not symbols & CostAnalyzer.__alphabet(f):
+                    continue
+
+                if marked and CostAnalyzer.__is_ambiguous(f):
+                    run += 1
+                elif not marked and set(CostAnalyzer.__first_symbols(f)[1]) < symbols:
+                    # Starts with only some of the star's symbols, so it splits the star's language
+                    marked = True
+                    run += 1
+
+            longest = max(longest, run)
+
+        return longest
+
+    @staticmethod
+    def __is_ambiguous(node) -> bool:
+        """
+        Tells if a factor is a star or can start with more than one position (e.g. a|b, (a|b)c),
+        only those make the subset construction branch
+
+        :param node: Node of the tree
+        :return True if the factor is ambiguous, False otherwise
+        """
+        return isinstance(node, KleeneNode) or len(CostAnalyzer.__first_symbols(node)[1]) > 1
+
+    @staticmethod
+    def __first_symbols(node) -> tuple:
+        """
+        Nullability and symbols of the first positions of a node
+
+        :param node: Node of the tree
+        :return (nullable, list of the symbols of the positions a match can start with)
+        """
+        if isinstance(node, LiteralNode):
+            return False, [node.literal]
+        elif isinstance(node, KleeneNode):
+            return True, CostAnalyzer.__first_symbols(node.literal)[1]
+        elif isinstance(node, ConcatNode):
+            left_nullable, left_first = CostAnalyzer.__first_symbols(node.left)
+            if not left_nullable:
+                return False, left_first
+
+            right_nullable, right_first = CostAnalyzer.__first_symbols(node.right)
+            return right_nullable, left_first + right_first
+
+        left_nullable, left_first = CostAnalyzer.__first_symbols(node.left)
+        right_nullable, right_first = CostAnalyzer.__first_symbols(node.right)
+
+        return left_nullable or right_nullable, left_first + right_first
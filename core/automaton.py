@@ -190,11 +190,13 @@ class Automaton:
 
         return state_transitions
 
-    def eNFA_to_NFA(self) -> 'Automaton':
+    def eNFA_to_NFA(self, budget=None) -> 'Automaton':
         """
         Convert automaton from epsilon-NFA to NFA
 
+        :param budget: CompileBudget checked while converting (see `CompileLimits.start`), None for no limit
         :return New Automaton
+        :raise CompileLimitExceeded in case the budget is exceeded
         """
         if self.is_epsilon_NFA():
             epsilon_closure_of_all_states = {}
@@ -204,6 +206,9 @@ class Automaton:
             for s in self.states:
                 epsilon_closure_of_all_states[s] = self.epsilon_closure_of_state(s)
 
+                if budget is not None:
+                    budget.check(len(self.states), len(self.transitions))
+
             # Know we should eliminate all epsilon transition
             self.eliminate_epsilon_transition()
 
@@ -224,20 +229,25 @@ class Automaton:
                         else:
                             new_transitions.update(result_transition)
 
+                if budget is not None:
+                    budget.check(len(self.states), len(new_transitions))
+
             if len(new_transitions) > 0:
                 self.transitions.clear()
                 self.transitions.update(new_transitions)
 
         return self
 
-    def NFA_to_DFA(self) -> 'Automaton':
+    def NFA_to_DFA(self, budget=None) -> 'Automaton':
         """
         Convert automaton from NFA to DFA
 
+        :param budget: CompileBudget checked while converting (see `CompileLimits.start`), None for no limit
         :return New Automaton
+        :raise CompileLimitExceeded in case the budget is exceeded
         """
         if self.is_epsilon_NFA():
-            self.eNFA_to_NFA()
+            self.eNFA_to_NFA(budget)
 
         #print(automaton)
         if self.is_NFA():
@@ -283,6 +293,10 @@ class Automaton:
                         # Here we are sure that the state has transitions to other ones
                         new_transitions.update({s: result_states[s]})
 
+                    # The subset construction may blow up, so we check after each new state processed
+                    if budget is not None:
+                        budget.check(state_number, len(new_transitions))
+
             self.init_states = {name_mapper[(self.init_states.pop(),)]}
             self.final_states = new_final_states
             self.states = new_states
@@ -295,6 +309,28 @@ class Automaton:
 
         return self
 
+    def reachable_states(self) -> set:
+        """
+        Get all states that can be reached from the initial states
+        (i.e. states left behind by the conversions are not counted)
+
+        :return Set of reachable states
+        """
+        reachable = set(self.init_states)
+        states_needs_processing = list(self.init_states)
+        successors = {}
+        for state, symbol in self.transitions:
+            successors.setdefault(state, set()).update(self.transitions[(state, symbol)])
+
+        while len(states_needs_processing) > 0:
+            state = states_needs_processing.pop()
+            for s in successors.get(state, ()):
+                if s not in reachable:
+                    reachable.add(s)
+                    states_needs_processing.append(s)
+
+        return reachable
+
     def __repr__(self) -> str:
         """
         Helps in debugging
@@ -0,0 +1,103 @@
+try:
+    import numpy as np
+except ImportError: # NumPy is optional, only the batch executor needs it
+    np = None
+
+from core.pattern import Pattern
+from core.regex import Regex
+
+
+class BatchMatcher:
+    """
+    BatchMatcher runs the DFA of a pattern over many literals at once with NumPy
+
+    The literals are packed into a padded 2-D array of symbol numbers (one column per position),
+    then a vector holding the state of every literal is advanced one column at a time
+    with fancy indexing into the transition table.
+    Literals that reach the dead state or their end are masked out of the next columns
+
+    Table columns:
+        0 ... k - 1    The symbols of the alphabet
+        k              Unknown character (i.e. goes to the dead state)
+        k + 1          Padding (i.e. stays in the same state)
+    """
+    def __init__(self, pattern: Pattern) -> None:
+        """
+        Initialize the transition table from a compiled pattern
+
+        :param pattern: Compiled pattern (see `Regex.compile`), rebuilt as a DFA if needed (see `Regex.compile_dfa`)
+        :raise ImportError in case NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("BatchMatcher requires NumPy (pip install numpy)")
+
+        pattern = Regex.compile_dfa(pattern)
+        symbols, table = pattern.dense_table()
+        self.dead_state = len(table) - 1
+        self.unknown = len(symbols)
+        self.padding = len(symbols) + 1
+
+        self.table = np.empty((len(table), len(symbols) + 2), dtype=np.int32)
+        self.table[:, :len(symbols)] = table
+        self.table[:, self.unknown] = self.dead_state
+        self.table[:, self.padding] = np.arange(len(table))
+
+        self.accepting = np.zeros(len(table), dtype=bool)
+        self.accepting[list(pattern.final_states)] = True
+        self.init_state = pattern.init_state
+
+        # Code point ---> symbol number, the last entry catches every code point out of range
+        max_code_point = max((ord(s) for s in symbols), default=0)
+        self.symbol_of_code_point = np.full(max_code_point + 2, self.unknown, dtype=np.int32)
+        for i, symbol in enumerate(symbols):
+            self.symbol_of_code_point[ord(symbol)] = i
+
+        self.symbol_dtype = np.uint8 if self.padding < 256 else np.uint32
+
+    def pack(self, literals: list) -> tuple:
+        """
+        Pack the literals into a padded array of symbol numbers
+
+        :param literals: List of strings
+        :return (Array of shape (longest length, number of literals) one row per position, array of lengths)
+        """
+        lengths = np.fromiter(map(len, literals), dtype=np.int64, count=len(literals))
+        width = int(lengths.max()) if len(literals) > 0 else 0
+
+        code_points = np.frombuffer(''.join(literals).encode('utf-32-le'), dtype=np.uint32)
+        code_points = np.minimum(code_points, len(self.symbol_of_code_point) - 1)
+
+        if len(code_points) == width * len(literals):
+            # Fixed-format literals (i.e. all of the same length) need no padding
+            symbols = self.symbol_of_code_point[code_points].astype(self.symbol_dtype).reshape(len(literals), width)
+        else:
+            symbols = np.full((len(literals), width), self.padding, dtype=self.symbol_dtype)
+            symbols[np.arange(width) < lengths[:, None]] = self.symbol_of_code_point[code_points]
+
+        # One row per position, so each step reads contiguous memory
+        return np.ascontiguousarray(symbols.T), lengths
+
+    def match(self, literals: list):
+        """
+        Tells for each literal if it respects the pattern
+
+        :param literals: List of strings
+        :return Boolean array, True where the literal match the pattern
+        """
+        symbols, lengths = self.pack(literals)
+        table = self.table
+        dead_state = self.dead_state
+
+        states = np.full(len(literals), self.init_state, dtype=np.int32)
+        active = np.flatnonzero(lengths > 0) # Literals still running
+        for position in range(symbols.shape[0]):
+            if len(active) == 0:
+                break
+
+            current = table[states[active], symbols[position, active]]
+            states[active] = current
+
+            # Mask out the literals that reached the dead state or their end
+            active = active[(current != dead_state) & (lengths[active] > position + 1)]
+
+        return self.accepting[states]
@@ -0,0 +1,273 @@
+from core.parser.tree.concat_node import ConcatNode
+from core.parser.tree.kleen_node import KleeneNode
+from core.parser.tree.literal_node import LiteralNode
+from core.parser.tree.pipe_node import PipeNode
+
+
+class BitParallelPattern:
+    """
+    BitParallelPattern is a compiled regular expression simulated with bit-parallelism,
+    there is no determinization, so compiling costs almost nothing
+
+    It uses the position automaton (i.e. Glushkov automaton) of the AST: each literal of the pattern is a position,
+    the set of active positions is held in one Python int (bit 0 is the initial position)
+
+    Foreach character:
+        active = Follow(active) & B[character]
+    B[character] is the mask of the positions labelled with the character, and Follow(active) is read
+    from tables precomputed for each byte of the mask (i.e. one table per 8 positions).
+    The few masks met while matching are memoized, so the loop is usually one lookup and one AND per character
+
+    Like the accepting sinks of the DFA, a mask is a sink when it holds a final position and every symbol
+    of the alphabet leads to a sink mask again: once reached, only the alphabet of the remaining characters matters
+    """
+    # Above this number of positions the tables get too many, the DFA is used instead
+    MAX_POSITIONS = 60
+    # Maximum number of memoized Follow(active)
+    MAX_CACHE = 1 << 16
+    # Maximum number of masks explored to tell if a mask is a sink
+    MAX_SINK_MASKS = 256
+    # Memoized in place of Follow(active) when the active mask is a sink
+    SINK = -1
+
+    def __init__(self, regex: str, ast) -> None:
+        """
+        Compute the masks and the follow tables of the pattern
+
+        :param regex: Pattern
+        :param ast: Abstract Syntax Tree of the pattern
+        """
+        self.regex = regex
+        self.symbol_masks = {} # Symbol ---> mask of the positions labelled with it
+        self.__follow = [0] # Position ---> mask of the positions that can come next
+        self.__cache = {} # Mask of active positions ---> mask of the next positions (or SINK)
+        nullable, first, last = self.__glushkov(ast)
+
+        self.__follow[0] = first
+        self.alphabet = frozenset(self.symbol_masks)
+        self.final_mask = last | (1 if nullable else 0)
+
+        # Follow of any mask, byte by byte (i.e. Follow(D) = tables[0][D & 255] | tables[1][(D >> 8) & 255] | ...)
+        self.tables = []
+        for k in range(0, len(self.__follow), 8):
+            table = [0] * 256
+            for byte in range(1, 256):
+                low_bit = (byte & -byte).bit_length() - 1
+                table[byte] = table[byte & (byte - 1)] | (self.__follow[k + low_bit] if k + low_bit < len(self.__follow) else 0)
+
+            self.tables.append(table)
+
+    @staticmethod
+    def count_positions(node) -> int:
+        """
+        Count the positions (i.e. literals) of the AST
+
+        :param node: Root of the Abstract Syntax Tree
+        :return Number of positions
+        """
+        if isinstance(node, LiteralNode):
+            return 1
+        elif isinstance(node, KleeneNode):
+            return BitParallelPattern.count_positions(node.literal)
+
+        return BitParallelPattern.count_positions(node.left) + BitParallelPattern.count_positions(node.right)
+
+    def match(self, literal: str) -> bool:
+        """
+        Tells if the literal respect the pattern
+
+        :param literal: A text
+        :return True if the literal match the pattern, False otherwise
+        """
+        symbol_masks = self.symbol_masks
+        cache = self.__cache
+        active = 1
+        characters = iter(literal)
+        for c in characters:
+            follow = cache.get(active)
+            if follow is None:
+                follow = self.__next_of(active)
+
+            if follow < 0: # Sink, every continuation over the alphabet is accepted
+                return c in self.alphabet and self.alphabet.issuperset(characters)
+
+            active = follow & symbol_masks.get(c, 0)
+            if active == 0: # No position left, no way back to a final one
+                return False
+
+        return active & self.final_mask != 0
+
+    def match_stream(self, chunks) -> bool:
+        """
+        Tells if the concatenation of the chunks respect the pattern,
+        chunks are consumed one by one, and the reading stops when no position is left or on a sink
+
+        :param chunks: Iterable of strings (e.g. file opened in text mode)
+        :return True if the text match the pattern, False otherwise
+        """
+        symbol_masks = self.symbol_masks
+        cache = self.__cache
+        alphabet = self.alphabet
+        active = 1
+        chunks = iter(chunks)
+        for chunk in chunks:
+            characters = iter(chunk)
+            for c in characters:
+                follow = cache.get(active)
+                if follow is None:
+                    follow = self.__next_of(active)
+
+                if follow < 0:
+                    # Only the membership of the remaining symbols to the alphabet matters
+                    if c not in alphabet or not alphabet.issuperset(characters):
+                        return False
+
+                    return all(alphabet.issuperset(rest) for rest in chunks)
+
+                active = follow & symbol_masks.get(c, 0)
+                if active == 0:
+                    return False
+
+        return active & self.final_mask != 0
+
+    def search(self, literal: str) -> bool:
+        """
+        Tells if some substring of the literal respect the pattern,
+        the initial position stays active so a match can start anywhere
+
+        :param literal: A text
+        :return True if a substring match the pattern, False otherwise
+        """
+        symbol_masks = self.symbol_masks
+        cache = self.__cache
+        final_mask = self.final_mask
+        if final_mask & 1:
+            return True
+
+        active = 1
+        for c in literal:
+            # A sink holds a final position, so the search returns before reaching one
+            follow = cache.get(active)
+            if follow is None:
+                follow = self.__next_of(active)
+
+            active = (follow & symbol_masks.get(c, 0)) | 1
+            if active & final_mask:
+                return True
+
+        return False
+
+    def __next_of(self, active: int) -> int:
+        """
+        Mask of the positions that can come after the active ones (or SINK), and memoize it
+
+        :param active: Mask of the active positions
+        :return Mask of the next positions, SINK if the active mask is a sink
+        """
+        cache = self.__cache
+        if len(cache) >= BitParallelPattern.MAX_CACHE: # No more room, the sinks are not looked for either
+            return self.__follow_of(active)
+
+        if active & self.final_mask and self.__is_sink(active):
+            return BitParallelPattern.SINK
+
+        result = self.__follow_of(active)
+        cache[active] = result
+
+        return result
+
+    def __is_sink(self, active: int) -> bool:
+        """
+        Tells if every mask reached from the active one holds a final position,
+        the masks found to be sinks are memoized
+
+        :param active: Mask of the active positions
+        :return True if the active mask is a sink, False otherwise (or too many masks to explore)
+        """
+        cache = self.__cache
+        final_mask = self.final_mask
+        masks = list(self.symbol_masks.values())
+        explored = {active}
+        stack = [active]
+        while stack:
+            follow = self.__follow_of(stack.pop())
+            for symbol_mask in masks:
+                mask = follow & symbol_mask
+                if mask in explored or cache.get(mask) == BitParallelPattern.SINK:
+                    continue
+
+                if mask & final_mask == 0 or len(explored) == BitParallelPattern.MAX_SINK_MASKS:
+                    return False
+
+                explored.add(mask)
+                stack.append(mask)
+
+        for mask in explored:
+            cache[mask] = BitParallelPattern.SINK
+
+        return True
+
+    def __follow_of(self, active: int) -> int:
+        """
+        Mask of the positions that can come after the active ones
+
+        :param active: Mask of the active positions
+        :return Mask of the next positions
+        """
+        result = 0
+        mask = active
+        for table in self.tables:
+            result |= table[mask & 255]
+            mask >>= 8
+            if mask == 0:
+                break
+
+        return result
+
+    def __glushkov(self, node) -> tuple:
+        """
+        Number the positions of the AST, and fill the masks and the follow of each position
+
+        :param node: Node of the tree
+        :return (nullable, mask of the first positions, mask of the last positions)
+        :raise Exception for unknown AST node
+        """
+        if isinstance(node, LiteralNode):
+            position = len(self.__follow)
+            self.__follow.append(0)
+            self.symbol_masks[node.literal] = self.symbol_masks.get(node.literal, 0) | (1 << position)
+
+            return False, 1 << position, 1 << position
+        elif isinstance(node, KleeneNode):
+            _, first, last = self.__glushkov(node.literal)
+            self.__add_follow(last, first)
+
+            return True, first, last
+        elif isinstance(node, ConcatNode):
+            left_nullable, left_first, left_last = self.__glushkov(node.left)
+            right_nullable, right_first, right_last = self.__glushkov(node.right)
+            self.__add_follow(left_last, right_first)
+
+            return (left_nullable and right_nullable,
+                    left_first | (right_first if left_nullable else 0),
+                    right_last | (left_last if right_nullable else 0))
+        elif isinstance(node, PipeNode):
+            left_nullable, left_first, left_last = self.__glushkov(node.left)
+            right_nullable, right_first, right_last = self.__glushkov(node.right)
+
+            return left_nullable or right_nullable, left_first | right_first, left_last | right_last
+        else:
+            raise Exception(f'Unknown AST node {node}')
+
+    def __add_follow(self, positions: int, mask: int) -> None:
+        """
+        Add the mask to the follow of each position
+
+        :param positions: Mask of positions
+        :param mask: Mask of the positions that can come next
+        :return None
+        """
+        while positions:
+            low_bit = positions & -positions
+            self.__follow[low_bit.bit_length() - 1] |= mask
+            positions ^= low_bit
@@ -0,0 +1,115 @@
+from bisect import bisect_left, bisect_right
+
+from core.pattern import Pattern
+from core.regex import Regex
+
+
+class CheckpointMatcher:
+    """
+    CheckpointMatcher keeps a text matched against a pattern while the text is edited
+
+    The state of the DFA is stored every `interval` characters (i.e. a checkpoint).
+    After an edit the DFA resumes from the last checkpoint before the edit,
+    and stops as soon as it reaches an old checkpoint past the edit in the same state as before,
+    since from there the rest of the run is the same. Re-validation cost grows with the edit, not with the text
+    """
+    DEAD_STATE = -1
+
+    def __init__(self, pattern: Pattern, text: str = '', interval: int = 1024) -> None:
+        """
+        Initialize the matcher with a first full scan
+
+        :param pattern: Compiled pattern (see `Regex.compile`), rebuilt as a DFA if needed (see `Regex.compile_dfa`)
+        :param text: Initial text
+        :param interval: Number of characters between two checkpoints
+        """
+        pattern = Regex.compile_dfa(pattern)
+        self.pattern = pattern
+        self.interval = interval
+        self.text = text
+        self.positions = [0] # Position of each checkpoint
+        self.states = [pattern.init_state] # State before the character at the position of each checkpoint
+        self.scanned = 0 # Number of characters run by the DFA for the last update
+
+        self.final_state = self.__advance(pattern.init_state, 0, len(text))
+
+    def match(self) -> bool:
+        """
+        Tells if the current text respect the pattern
+
+        :return True if the text match the pattern, False otherwise
+        """
+        return self.final_state in self.pattern.final_states
+
+    def edit(self, start: int, end: int, replacement: str = '') -> bool:
+        """
+        Replace text[start:end] with the replacement and re-validate the text
+
+        :param start: Start of the edited range
+        :param end: End of the edited range (excluded)
+        :param replacement: New text of the range (empty for a deletion, start == end for an insertion)
+        :return True if the new text match the pattern, False otherwise
+        :raise IndexError in case the range is out of the text
+        """
+        if not 0 <= start <= end <= len(self.text):
+            raise IndexError(f'Range [{start}, {end}) out of text of length {len(self.text)}')
+
+        delta = len(replacement) - (end - start)
+        self.text = self.text[:start] + replacement + self.text[end:]
+        self.scanned = 0
+
+        # Checkpoints up to the edit are still valid, those after it are shifted by delta
+        k = bisect_right(self.positions, start)
+        tail = bisect_left(self.positions, end)
+        tail_positions = [p + delta for p in self.positions[tail:] if p + delta > start]
+        tail_states = self.states[len(self.positions) - len(tail_positions):]
+        del self.positions[k:]
+        del self.states[k:]
+
+        pos, state = self.positions[-1], self.states[-1]
+        for i, (tail_position, tail_state) in enumerate(zip(tail_positions, tail_states)):
+            state = self.__advance(state, pos, tail_position)
+            pos = tail_position
+
+            if state == tail_state:
+                # Same state at the same place of the unchanged text, so the rest of the run is the same
+                self.positions.extend(tail_positions[i:])
+                self.states.extend(tail_states[i:])
+
+                return self.match()
+
+            self.positions.append(pos)
+            self.states.append(state)
+
+        self.final_state = self.__advance(state, pos, len(self.text))
+
+        return self.match()
+
+    def __advance(self, state: int, start: int, end: int) -> int:
+        """
+        Run the DFA over text[start:end], adding a checkpoint every `interval` characters (end excluded)
+
+        :param state: State before the character at start
+        :param start: Start of the range
+        :param end: End of the range
+        :return State after the character before end
+        """
+        transitions = self.pattern.transitions
+        for p in range(start + self.interval, end + self.interval, self.interval):
+            block_end = min(p, end)
+            if state != CheckpointMatcher.DEAD_STATE:
+                consumed = 0
+                for consumed, c in enumerate(self.text[p - self.interval:block_end], 1):
+                    state = transitions.get((state, c))
+                    if state is None:
+                        state = CheckpointMatcher.DEAD_STATE
+                        break
+
+                # Only the characters actually run, the rest of the block is skipped on a dead state
+                self.scanned += consumed
+
+            if p < end:
+                self.positions.append(p)
+                self.states.append(state)
+
+        return state
@@ -0,0 +1,168 @@
+import sys
+from array import array
+
+from core.pattern import Pattern
+from core.regex import Regex
+
+
+class CompressedTable:
+    """
+    CompressedTable stores the transitions of a DFA in a few flat `array` buffers,
+    like the tables of classic scanner generators
+
+    Compression:
+        (1) Row deduplication: states with the same row of transitions share it
+        (2) Default transitions: each row keeps only the entries that differ from its most frequent target
+        (3) Row displacement (i.e. comb packing): the remaining entries of all rows are packed into one `next` array,
+            each row starts at its own `base`, and the `check` array tells which row owns a slot
+
+    Each row gets its own base, so `check` holds the base of the owner and the lookup needs no row number:
+        i = base[state] + symbol
+        next state = next[i] if check[i] == base[state] else default[state]
+    """
+    EMPTY = -1
+
+    def __init__(self, pattern: Pattern) -> None:
+        """
+        Compress the transitions of a compiled pattern
+
+        :param pattern: Compiled pattern (see `Regex.compile`), rebuilt as a DFA if needed (see `Regex.compile_dfa`)
+        """
+        pattern = Regex.compile_dfa(pattern)
+        symbols, table = pattern.dense_table()
+        self.symbols = symbols
+        self.symbol_index = {s: i for i, s in enumerate(symbols)}
+        self.dead_state = len(table) - 1
+        self.init_state = pattern.init_state
+        self.final_states = pattern.final_states
+        self.number_of_states = len(table)
+
+        # Row deduplication
+        row_mapper = {}
+        row_of_state = []
+        for row in table:
+            row_of_state.append(row_mapper.setdefault(tuple(row), len(row_mapper)))
+        rows = list(row_mapper)
+
+        # Default transitions, only the other entries are packed
+        defaults = []
+        entries = []
+        for row in rows:
+            default = max(set(row), key=row.count) if len(row) > 0 else self.dead_state
+            defaults.append(default)
+            entries.append([(i, target) for i, target in enumerate(row) if target != default])
+
+        # Row displacement, rows with the most entries are placed first
+        bases = [0] * len(rows)
+        self.next = array('i')
+        self.check = array('i')
+        self.__bases_used = set()
+        self.__first_free = 0 # No empty slot before this one
+        for r in sorted(range(len(rows)), key=lambda r: -len(entries[r])):
+            base = self.__find_base(entries[r])
+            bases[r] = base
+            self.__bases_used.add(base)
+
+            if len(self.check) < base + len(symbols):
+                grow = base + len(symbols) - len(self.check)
+                self.next.extend([CompressedTable.EMPTY] * grow)
+                self.check.extend([CompressedTable.EMPTY] * grow)
+
+            for i, target in entries[r]:
+                self.next[base + i] = target
+                self.check[base + i] = base
+
+            while self.__first_free < len(self.check) and self.check[self.__first_free] != CompressedTable.EMPTY:
+                self.__first_free += 1
+
+        # Per state, so the lookup does not go through the row number
+        self.base = array('i', (bases[r] for r in row_of_state))
+        self.default = array('i', (defaults[r] for r in row_of_state))
+        self.unique_rows = len(rows)
+
+    def lookup(self, state: int, symbol: str) -> int:
+        """
+        Goto from one state to another one based on symbol
+
+        :param state: A state
+        :param symbol: Symbol
+        :return Next state (`dead_state` if the symbol is not in the alphabet)
+        """
+        i = self.symbol_index.get(symbol)
+        if i is None:
+            return self.dead_state
+
+        base = self.base[state]
+        i += base
+
+        return self.next[i] if self.check[i] == base else self.default[state]
+
+    def match(self, literal: str) -> bool:
+        """
+        Tells if the literal respect the pattern
+
+        :param literal: A text
+        :return True if the literal match the pattern, False otherwise
+        """
+        symbol_index = self.symbol_index
+        base, default, next, check = self.base, self.default, self.next, self.check
+        dead_state = self.dead_state
+        state = self.init_state
+        for c in literal:
+            i = symbol_index.get(c)
+            if i is None:
+                return False
+
+            b = base[state]
+            i += b
+            state = next[i] if check[i] == b else default[state]
+            if state == dead_state:
+                return False
+
+        return state in self.final_states
+
+    def footprint(self) -> dict:
+        """
+        Memory footprint of the transitions in bytes, for the compressed table,
+        a dense table of 32-bit integers, and the `(state, symbol) ---> {state}` dictionaries of `Automaton`
+
+        :return Dictionary of sizes and counts
+        """
+        compressed = sum(a.buffer_info()[1] * a.itemsize for a in (self.base, self.default, self.next, self.check))
+        dense = self.number_of_states * len(self.symbols) * 4
+
+        # Each edge of the automaton is a key tuple and a set holding one state
+        edges = 0
+        for state in range(self.number_of_states - 1):
+            for symbol in self.symbols:
+                if self.lookup(state, symbol) != self.dead_state:
+                    edges += 1
+
+        sample_key, sample_set = (0, 'a'), {0}
+        dictionary = sys.getsizeof({i: None for i in range(edges)}) + edges * (sys.getsizeof(sample_key) + sys.getsizeof(sample_set))
+
+        return {
+            'states': self.number_of_states,
+            'symbols': len(self.symbols),
+            'unique_rows': self.unique_rows,
+            'packed_slots': len(self.next),
+            'edges': edges,
+            'dictionary_bytes': dictionary,
+            'dense_bytes': dense,
+            'compressed_bytes': compressed,
+        }
+
+    def __find_base(self, entries: list) -> int:
+        """
+        Find the first unused base where all the entries of a row fall on empty slots
+
+        :param entries: List of (symbol, target), sorted by symbol
+        :return Base
+        """
+        check = self.check
+        base = max(0, self.__first_free - entries[0][0]) if len(entries) > 0 else 0 # The first entry can not land before the first empty slot
+        while True:
+            if base not in self.__bases_used and all(base + i >= len(check) or check[base + i] == CompressedTable.EMPTY for i, _ in entries):
+                return base
+
+            base += 1
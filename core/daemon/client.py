@@ -0,0 +1,124 @@
+import json
+import socket
+
+from core.daemon.protocol import Protocol
+
+
+class MatchClient:
+    """
+    MatchClient is a thin synchronous client of the matching daemon (see `MatchServer`)
+    """
+    def __init__(self, path: str = None, host: str = '127.0.0.1', port: int = 7878) -> None:
+        """
+        Connect to the daemon
+
+        :param path: Path of the Unix socket, TCP is used if None
+        :param host: TCP host
+        :param port: TCP port
+        """
+        if path is not None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(path)
+        else:
+            self.socket = socket.create_connection((host, port))
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.stream = self.socket.makefile('rb')
+        self.next_id = 0
+
+    def match(self, pattern: str, texts: list) -> list:
+        """
+        Tells for each text if it respects the pattern
+
+        :param pattern: Pattern
+        :param texts: List of texts
+        :return List of booleans
+        :raise Exception in case the daemon reports an error (e.g. invalid pattern)
+        """
+        return self.pipeline([(Protocol.MATCH, pattern, texts)])[0]
+
+    def search(self, pattern: str, texts: list) -> list:
+        """
+        Tells for each text if some substring respects the pattern
+
+        :param pattern: Pattern
+        :param texts: List of texts
+        :return List of booleans
+        :raise Exception in case the daemon reports an error (e.g. invalid pattern)
+        """
+        return self.pipeline([(Protocol.SEARCH, pattern, texts)])[0]
+
+    def stats(self) -> dict:
+        """
+        Cache and latency metrics of the daemon
+
+        :return Dictionary of metrics
+        """
+        return self.pipeline([(Protocol.STATS, '', [])])[0]
+
+    def pipeline(self, requests: list) -> list:
+        """
+        Send all the requests at once, then read all the responses
+
+        :param requests: List of (operation, pattern, texts)
+        :return List of results (list of booleans, or dictionary for STATS) in the order of the requests
+        :raise Exception in case the daemon reports an error
+        """
+        first_id = self.next_id
+        self.socket.sendall(b''.join(
+            Protocol.encode_request(first_id + i, operation, pattern, texts) for i, (operation, pattern, texts) in enumerate(requests)
+        ))
+        self.next_id += len(requests)
+
+        results = []
+        for i, (operation, _, _) in enumerate(requests):
+            length, = Protocol.LENGTH.unpack(self.__read(Protocol.LENGTH.size))
+            request_id, status, payload = Protocol.decode_response(self.__read(length))
+            if request_id != first_id + i:
+                raise Exception(f'Unexpected response {request_id} for request {first_id + i}')
+
+            if status != Protocol.OK:
+                raise Exception(payload.decode('utf-8'))
+
+            results.append(json.loads(payload) if operation == Protocol.STATS else [b == 1 for b in payload])
+
+        return results
+
+    def close(self) -> None:
+        """
+        Close the connection
+
+        :return None
+        """
+        self.stream.close()
+        self.socket.close()
+
+    def __read(self, size: int) -> bytes:
+        """
+        Read exactly `size` bytes
+
+        :param size: Number of bytes
+        :return Bytes
+        :raise ConnectionError in case the daemon closed the connection
+        """
+        data = self.stream.read(size)
+        if len(data) < size:
+            raise ConnectionError('Connection closed by the daemon')
+
+        return data
+
+    def __enter__(self) -> 'MatchClient':
+        """
+        Use the client in a `with` block
+
+        :return The client
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Close the connection at the end of the `with` block
+
+        :return None
+        """
+        self.close()
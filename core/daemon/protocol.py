@@ -0,0 +1,93 @@
+import struct
+
+
+class Protocol:
+    """
+    Protocol class encapsulate the framing of the requests and responses of the matching daemon
+
+    Every message is a frame: length of the body (4 bytes, big-endian) followed by the body
+
+    Request body:
+        request id (u32), operation (u8), number of texts (u32),
+        pattern (u32 length + UTF-8), each text (u32 length + UTF-8)
+
+    Response body:
+        request id (u32), status (u8), count (u32), then
+            MATCH / SEARCH: one byte (0 or 1) per text
+            STATS / error:  `count` bytes of UTF-8 (JSON for STATS, message for an error)
+    """
+    MATCH = 1
+    SEARCH = 2
+    STATS = 3
+
+    OK = 0
+    ERROR = 1
+
+    LENGTH = struct.Struct('!I')
+    HEADER = struct.Struct('!IBI')
+
+    @staticmethod
+    def encode_request(request_id: int, operation: int, pattern: str = '', texts: list = ()) -> bytes:
+        """
+        Build the frame of a request
+
+        :param request_id: Id echoed in the response
+        :param operation: MATCH, SEARCH or STATS
+        :param pattern: Pattern
+        :param texts: List of texts
+        :return Frame
+        """
+        parts = [Protocol.HEADER.pack(request_id, operation, len(texts))]
+        for s in (pattern, *texts):
+            data = s.encode('utf-8')
+            parts.append(Protocol.LENGTH.pack(len(data)))
+            parts.append(data)
+
+        body = b''.join(parts)
+
+        return Protocol.LENGTH.pack(len(body)) + body
+
+    @staticmethod
+    def decode_request(body: bytes) -> tuple:
+        """
+        Read the body of a request
+
+        :param body: Body of the frame
+        :return (request id, operation, pattern, list of texts)
+        """
+        request_id, operation, count = Protocol.HEADER.unpack_from(body, 0)
+        offset = Protocol.HEADER.size
+        strings = []
+        for _ in range(count + 1):
+            length, = Protocol.LENGTH.unpack_from(body, offset)
+            offset += Protocol.LENGTH.size
+            strings.append(body[offset:offset + length].decode('utf-8'))
+            offset += length
+
+        return request_id, operation, strings[0], strings[1:]
+
+    @staticmethod
+    def encode_response(request_id: int, status: int, payload: bytes) -> bytes:
+        """
+        Build the frame of a response
+
+        :param request_id: Id of the request
+        :param status: OK or ERROR
+        :param payload: Results (one byte per text) or UTF-8 text
+        :return Frame
+        """
+        body = Protocol.HEADER.pack(request_id, status, len(payload)) + payload
+
+        return Protocol.LENGTH.pack(len(body)) + body
+
+    @staticmethod
+    def decode_response(body: bytes) -> tuple:
+        """
+        Read the body of a response
+
+        :param body: Body of the frame
+        :return (request id, status, payload)
+        """
+        request_id, status, count = Protocol.HEADER.unpack_from(body, 0)
+
+        return request_id, status, body[Protocol.HEADER.size:Protocol.HEADER.size + count]
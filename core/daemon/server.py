@@ -0,0 +1,209 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core.daemon.protocol import Protocol
+from core.limits import CompileLimitExceeded, CompileLimits
+from core.regex import Regex
+
+
+class MatchServer:
+    """
+    MatchServer is an asyncio matching daemon that keeps the compiled patterns in an LRU cache,
+    so short-lived clients pay neither the interpreter startup nor the compilation
+
+    Requests on a connection may be pipelined (i.e. sent without waiting for the responses),
+    they are answered in order, and each request carries a batch of texts for one pattern
+
+    Only the cache hits are answered on the event loop, a missing pattern is compiled in a worker process,
+    so a costly pattern never stalls the other connections
+    """
+    def __init__(self, cache_size: int = 1024, latency_samples: int = 10000, limits: CompileLimits = None,
+                 compile_workers: int = 1) -> None:
+        """
+        Initialize the server
+
+        :param cache_size: Maximum number of compiled patterns kept
+        :param latency_samples: Number of recent request latencies kept for the percentiles
+        :param limits: Compile limits applied to the patterns of the clients, None for no limit
+        :param compile_workers: Number of worker processes compiling the missing patterns
+        """
+        self.cache_size = cache_size
+        self.limits = limits
+        self.compile_workers = compile_workers
+        self.executor = None # Started by `serve`
+        self.cache = OrderedDict() # Pattern ---> compiled pattern, least recently used first
+        self.pending = {} # Pattern ---> future of its compilation, shared by the requests waiting for it
+        self.latencies = deque(maxlen=latency_samples) # Seconds
+        self.metrics = {
+            'connections': 0,
+            'requests': 0,
+            'texts': 0,
+            'errors': 0,
+            'rejected_patterns': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'cache_evictions': 0,
+        }
+
+    async def serve(self, path: str = None, host: str = '127.0.0.1', port: int = 7878) -> None:
+        """
+        Listen on a Unix socket, or on a TCP port, until cancelled
+
+        :param path: Path of the Unix socket, TCP is used if None
+        :param host: TCP host
+        :param port: TCP port
+        :return None
+        """
+        self.executor = ProcessPoolExecutor(max_workers=self.compile_workers)
+        try:
+            if path is not None:
+                server = await asyncio.start_unix_server(self.handle_connection, path=path)
+            else:
+                server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the requests of a connection in order until the client closes it
+
+        :param reader: Stream of the requests
+        :param writer: Stream of the responses
+        :return None
+        """
+        self.metrics['connections'] += 1
+        try:
+            while True:
+                try:
+                    length, = Protocol.LENGTH.unpack(await reader.readexactly(Protocol.LENGTH.size))
+                    body = await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    break
+
+                # Awaited before the next request is read, so the responses stay in order
+                writer.write(await self.handle_request(body))
+
+                # Returns at once unless the client stopped reading, so pipelined requests are not slowed down
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_request(self, body: bytes) -> bytes:
+        """
+        Answer one request
+
+        :param body: Body of the request frame
+        :return Response frame
+        """
+        start = time.perf_counter()
+        request_id = 0
+        try:
+            request_id, operation, pattern, texts = Protocol.decode_request(body)
+            self.metrics['requests'] += 1
+
+            if operation == Protocol.STATS:
+                return Protocol.encode_response(request_id, Protocol.OK, json.dumps(self.stats()).encode('utf-8'))
+
+            if operation not in (Protocol.MATCH, Protocol.SEARCH):
+                raise Exception(f'Unknown operation {operation}')
+
+            compiled = await self.compile(pattern)
+            test = compiled.match if operation == Protocol.MATCH else compiled.search
+            self.metrics['texts'] += len(texts)
+            response = Protocol.encode_response(request_id, Protocol.OK, bytes(test(t) for t in texts))
+        except Exception as e:
+            if isinstance(e, CompileLimitExceeded):
+                self.metrics['rejected_patterns'] += 1
+
+            self.metrics['errors'] += 1
+            return Protocol.encode_response(request_id, Protocol.ERROR, str(e).encode('utf-8'))
+
+        self.latencies.append(time.perf_counter() - start)
+
+        return response
+
+    async def compile(self, pattern: str):
+        """
+        Get the compiled pattern from the cache, compile it in a worker process on a miss
+
+        :param pattern: Pattern
+        :return Compiled pattern
+        :raise SyntaxError in case the pattern is not valid
+        :raise CompileLimitExceeded in case the pattern is too costly to compile
+        """
+        compiled = self.cache.get(pattern)
+        if compiled is not None:
+            self.metrics['cache_hits'] += 1
+            self.cache.move_to_end(pattern)
+            return compiled
+
+        self.metrics['cache_misses'] += 1
+        if self.executor is None: # Not serving (e.g. requests handled directly), compiled in place
+            compiled = MatchServer.compile_pattern(pattern, self.limits)
+        else:
+            future = self.pending.get(pattern)
+            if future is None:
+                future = asyncio.get_running_loop().run_in_executor(self.executor, MatchServer.compile_pattern, pattern, self.limits)
+                self.pending[pattern] = future
+
+            try:
+                compiled = await future
+            finally:
+                self.pending.pop(pattern, None)
+
+        self.cache[pattern] = compiled
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.metrics['cache_evictions'] += 1
+
+        return compiled
+
+    @staticmethod
+    def compile_pattern(pattern: str, limits: CompileLimits):
+        """
+        Compile a pattern in a worker process
+
+        :param pattern: Pattern
+        :param limits: Compile limits, None for no limit
+        :return Compiled pattern
+        :raise SyntaxError in case the pattern is not valid
+        :raise CompileLimitExceeded in case the pattern is too costly to compile
+        """
+        return Regex.compile(pattern, limits=limits)
+
+    def stats(self) -> dict:
+        """
+        Cache and latency metrics
+
+        :return Dictionary of metrics, latencies in microseconds
+        """
+        latencies = sorted(self.latencies)
+
+        return dict(
+            self.metrics,
+            cache_size=len(self.cache),
+            cache_capacity=self.cache_size,
+            latency_p50_us=MatchServer.__percentile(latencies, 0.50),
+            latency_p99_us=MatchServer.__percentile(latencies, 0.99),
+            latency_max_us=MatchServer.__percentile(latencies, 1.0),
+        )
+
+    @staticmethod
+    def __percentile(latencies: list, p: float) -> float:
+        """
+        Percentile of sorted latencies
+
+        :param latencies: Sorted latencies in seconds
+        :param p: Percentile between 0 and 1
+        :return Latency in microseconds, 0 if there is no latency
+        """
+        if len(latencies) == 0:
+            return 0.0
+
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e6, 1)
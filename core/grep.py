@@ -0,0 +1,176 @@
+import io
+import mmap
+import os
+import stat
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.regex import Regex
+
+
+class Grep:
+    """
+    Grep class encapsulate the scanning of files line by line with a compiled pattern
+
+    Each worker process compiles the pattern once (see `init_worker`), then scans whole files,
+    the output of a file is formatted by the worker and returned as one string,
+    so the parent process only does one write per file
+    """
+    # Files bigger than this are memory-mapped instead of read in memory
+    MMAP_THRESHOLD = 1 << 20
+
+    pattern = None
+    options = {}
+
+    @staticmethod
+    def init_worker(regex: str, options: dict) -> None:
+        """
+        Compile the pattern for the current process
+
+        :param regex: Pattern
+        :param options: Dictionary of options (search, count, files_with_matches, line_numbers, with_filename)
+        :return None
+        """
+        Grep.pattern = Regex.compile(regex)
+        Grep.options = options
+
+    @staticmethod
+    def collect_files(paths: list) -> list:
+        """
+        Expand the directories into the files they contain (recursively)
+
+        :param paths: List of files and directories
+        :return List of files
+        """
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, dirs, names in os.walk(path):
+                    dirs.sort()
+                    files.extend(os.path.join(root, name) for name in sorted(names))
+            else:
+                files.append(path)
+
+        return files
+
+    @staticmethod
+    def scan_file(path: str) -> tuple:
+        """
+        Scan a file line by line, lines end with `\n` (a `\r` before it is dropped)
+
+        :param path: Path of the file
+        :return (Output to print, number of matching lines, number of lines, number of bytes, error message or None)
+        """
+        try:
+            with open(path, 'rb') as f:
+                info = os.fstat(f.fileno())
+                # Pipes and devices have no size, they are read until the end
+                if stat.S_ISREG(info.st_mode):
+                    if info.st_size == 0:
+                        return Grep.__scan_lines(path, iter(())) + (0, None)
+
+                    if info.st_size >= Grep.MMAP_THRESHOLD:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            return Grep.__scan_lines(path, iter(mm.readline, b'')) + (info.st_size, None)
+
+                data = f.read()
+                return Grep.__scan_lines(path, iter(io.BytesIO(data))) + (len(data), None)
+        except OSError as e:
+            return '', 0, 0, 0, f"{path}: {e.strerror}"
+
+    @staticmethod
+    def __scan_lines(path: str, lines) -> tuple:
+        """
+        Helper for `scan_file`, matches each line and formats the output
+
+        :param path: Path of the file (used as prefix)
+        :param lines: Iterator of lines as bytes, split on `\n` only
+        :return (Output to print, number of matching lines, number of lines)
+        """
+        options = Grep.options
+        test = Grep.pattern.search if options['search'] else Grep.pattern.match
+        prefix = f"{path}:" if options['with_filename'] else ''
+        output = []
+        matches = 0
+        number = 0
+        for number, line in enumerate(lines, 1):
+            line = line.decode('utf-8', errors='replace')
+            if line.endswith('\n'):
+                line = line[:-1]
+
+            if line.endswith('\r'):
+                line = line[:-1]
+            if not test(line):
+                continue
+
+            matches += 1
+            if options['files_with_matches']:
+                # The first match is enough, the rest of the file is not read
+                return f"{path}\n", matches, number
+
+            if not options['count']:
+                output.append(f"{prefix}{number}:{line}\n" if options['line_numbers'] else f"{prefix}{line}\n")
+
+        if options['count']:
+            return f"{prefix}{matches}\n", matches, number
+
+        return ''.join(output), matches, number
+
+    @staticmethod
+    def run(regex: str, paths: list, options: dict, jobs: int = 1, stats: bool = False) -> int:
+        """
+        Scan the files and write the results to the standard output
+
+        :param regex: Pattern
+        :param paths: List of files and directories
+        :param options: Dictionary of options (search, count, files_with_matches, line_numbers)
+        :param jobs: Number of worker processes
+        :param stats: Print the throughput on the standard error
+        :return Exit status (0 some line matched, 1 no line matched, 2 error)
+        """
+        files = Grep.collect_files(paths)
+        options = dict(options, with_filename=len(files) > 1 or any(os.path.isdir(p) for p in paths))
+
+        start = time.perf_counter()
+        if jobs > 1 and len(files) > 1:
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=Grep.init_worker, initargs=(regex, options))
+            results = executor.map(Grep.scan_file, files, chunksize=max(1, len(files) // (jobs * 4)))
+        else:
+            executor = None
+            Grep.init_worker(regex, options)
+            results = map(Grep.scan_file, files)
+
+        total_matches, total_lines, total_bytes, errors = 0, 0, 0, 0
+        out = sys.stdout
+        try:
+            for output, matches, lines, size, error in results:
+                if error is not None:
+                    errors += 1
+                    print(f"chameleon: {error}", file=sys.stderr)
+                    continue
+
+                if output:
+                    out.write(output)
+
+                total_matches += matches
+                total_lines += lines
+                total_bytes += size
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        out.flush()
+        elapsed = time.perf_counter() - start
+
+        if stats:
+            print("-" * 40, file=sys.stderr)
+            print(f"Files: {len(files)}  Lines: {total_lines}  Matches: {total_matches}", file=sys.stderr)
+            print(f"Bytes: {total_bytes}  Time: {elapsed:.3f}s", file=sys.stderr)
+            if elapsed > 0:
+                print(f"Throughput: {total_bytes / elapsed / (1 << 20):.2f} MiB/s  {total_lines / elapsed:.0f} lines/s", file=sys.stderr)
+
+        if errors > 0:
+            return 2
+
+        return 0 if total_matches > 0 else 1
@@ -0,0 +1,109 @@
+import time
+
+
+class CompileLimitExceeded(Exception):
+    """
+    Raised when the compilation of a pattern goes over one of its limits (see `CompileLimits`)
+    """
+    def __init__(self, limit: str, value, maximum) -> None:
+        """
+        Initialize the exception
+
+        :param limit: Name of the limit (i.e. states, transitions, memory, seconds)
+        :param value: Value reached (or estimated)
+        :param maximum: Maximum allowed
+        """
+        super().__init__(f'Compile limit exceeded: {limit} {value} > {maximum}')
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle the exception with its own arguments (e.g. raised in a worker process)
+
+        :return (class, arguments)
+        """
+        return CompileLimitExceeded, (self.limit, self.value, self.maximum)
+
+
+class CompileLimits:
+    """
+    CompileLimits define the resources a compilation may use, None means unlimited
+
+    The memory is estimated from the number of states and transitions of the automaton being built
+    (i.e. the `(state, symbol) ---> {state}` dictionaries of `Automaton`)
+    """
+    BYTES_PER_STATE = 200
+    BYTES_PER_TRANSITION = 400
+
+    def __init__(self, max_states: int = None, max_transitions: int = None, max_memory: int = None, max_seconds: float = None) -> None:
+        """
+        Initialize the limits
+
+        :param max_states: Maximum number of states of each automaton (epsilon-NFA, NFA, DFA)
+        :param max_transitions: Maximum number of transitions of each automaton
+        :param max_memory: Maximum estimated memory in bytes
+        :param max_seconds: Maximum wall time of the whole compilation
+        """
+        self.max_states = max_states
+        self.max_transitions = max_transitions
+        self.max_memory = max_memory
+        self.max_seconds = max_seconds
+
+    def start(self) -> 'CompileBudget':
+        """
+        Start the clock of one compilation
+
+        :return Budget checked by the conversion loops
+        """
+        return CompileBudget(self)
+
+    def check_sizes(self, states: int, transitions: int) -> None:
+        """
+        Check sizes against the limits
+
+        :param states: Number of states
+        :param transitions: Number of transitions
+        :return None
+        :raise CompileLimitExceeded in case a limit is exceeded
+        """
+        if self.max_states is not None and states > self.max_states:
+            raise CompileLimitExceeded('states', states, self.max_states)
+
+        if self.max_transitions is not None and transitions > self.max_transitions:
+            raise CompileLimitExceeded('transitions', transitions, self.max_transitions)
+
+        memory = states * CompileLimits.BYTES_PER_STATE + transitions * CompileLimits.BYTES_PER_TRANSITION
+        if self.max_memory is not None and memory > self.max_memory:
+            raise CompileLimitExceeded('memory', memory, self.max_memory)
+
+
+class CompileBudget:
+    """
+    CompileBudget is one compilation running under limits, it keeps the time the compilation started
+    """
+    def __init__(self, limits: CompileLimits) -> None:
+        """
+        Initialize the budget
+
+        :param limits: Limits of the compilation
+        """
+        self.limits = limits
+        self.start = time.monotonic()
+
+    def check(self, states: int, transitions: int) -> None:
+        """
+        Check the current size of the automaton being built, and the elapsed time
+
+        :param states: Number of states
+        :param transitions: Number of transitions
+        :return None
+        :raise CompileLimitExceeded in case a limit is exceeded
+        """
+        self.limits.check_sizes(states, transitions)
+
+        if self.limits.max_seconds is not None:
+            elapsed = time.monotonic() - self.start
+            if elapsed > self.limits.max_seconds:
+                raise CompileLimitExceeded('seconds', round(elapsed, 3), self.limits.max_seconds)
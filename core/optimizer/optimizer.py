@@ -0,0 +1,259 @@
+from core.parser.tree.concat_node import ConcatNode
+from core.parser.tree.kleen_node import KleeneNode
+from core.parser.tree.literal_node import LiteralNode
+from core.parser.tree.pipe_node import PipeNode
+
+
+class Optimizer:
+    """
+    Optimizer class encapsulate the algebraic rewrites applied on the AST
+    before the construction of the automaton
+    (i.e. every node removed here is a set of states the determinization does not have to undo later)
+
+    Rewrites:
+        (1) Star idempotence            (a*)*     ---> a*
+                                        (a*|b)*   ---> (a|b)*
+        (2) Adjacent stars              a*a*      ---> a*
+        (3) Duplicate alternatives      a|a       ---> a
+                                        a|a*      ---> a*
+        (4) Common prefix factoring     ab|ac     ---> a(b|c)
+        (5) Common suffix factoring     ac|bc     ---> (a|b)c
+        (6) Flattening of nested concatenations and alternations
+    """
+    @staticmethod
+    def optimize(node):
+        """
+        Rewrite the AST until none of the rules applies
+
+        :param node: Root of the Abstract Syntax Tree
+        :return Equivalent Abstract Syntax Tree (it recognizes the same language)
+        :raise Exception for unknown AST node
+        """
+        if isinstance(node, LiteralNode):
+            return node
+        elif isinstance(node, KleeneNode):
+            return Optimizer.__optimize_kleene_node(node)
+        elif isinstance(node, ConcatNode):
+            return Optimizer.__optimize_concat_node(node)
+        elif isinstance(node, PipeNode):
+            return Optimizer.__optimize_pipe_node(node)
+        else:
+            raise Exception(f'Unknown AST node {node}')
+
+    @staticmethod
+    def count_nodes(node) -> int:
+        """
+        Count the nodes of the AST
+
+        :param node: Root of the Abstract Syntax Tree
+        :return Number of nodes
+        """
+        if isinstance(node, KleeneNode):
+            return 1 + Optimizer.count_nodes(node.literal)
+        elif isinstance(node, (ConcatNode, PipeNode)):
+            return 1 + Optimizer.count_nodes(node.left) + Optimizer.count_nodes(node.right)
+
+        return 1
+
+    @staticmethod
+    def report(node) -> dict:
+        """
+        Optimize the AST and report the number of nodes before and after
+
+        :param node: Root of the Abstract Syntax Tree
+        :return Dictionary (nodes_before, nodes_after, ast)
+        """
+        optimized = Optimizer.optimize(node)
+
+        return {
+            'nodes_before': Optimizer.count_nodes(node),
+            'nodes_after': Optimizer.count_nodes(optimized),
+            'ast': optimized,
+        }
+
+    @staticmethod
+    def __optimize_kleene_node(node):
+        """
+        Apply star idempotence (i.e. (a*)* = a* and (a*|b)* = (a|b)*)
+
+        :param node: Kleene node
+        :return Optimized node
+        """
+        inner = Optimizer.optimize(node.literal)
+
+        while isinstance(inner, KleeneNode):
+            inner = inner.literal
+
+        if isinstance(inner, PipeNode):
+            alternatives = [a.literal if isinstance(a, KleeneNode) else a for a in Optimizer.__flatten(inner, PipeNode)]
+            inner = Optimizer.__optimize_alternatives(alternatives)
+
+            while isinstance(inner, KleeneNode):
+                inner = inner.literal
+
+        return KleeneNode(inner)
+
+    @staticmethod
+    def __optimize_concat_node(node):
+        """
+        Flatten the concatenation and merge adjacent identical stars (i.e. a*a* = a*)
+
+        :param node: Concat node
+        :return Optimized node
+        """
+        factors = []
+        for factor in Optimizer.__flatten(node, ConcatNode):
+            factor = Optimizer.optimize(factor)
+
+            # The optimized factor may itself be a concatenation (e.g. factoring of (ab|ac))
+            for f in Optimizer.__flatten(factor, ConcatNode):
+                if isinstance(f, KleeneNode) and len(factors) > 0 and Optimizer.__key(factors[-1]) == Optimizer.__key(f):
+                    continue
+
+                factors.append(f)
+
+        return Optimizer.__build(factors, ConcatNode)
+
+    @staticmethod
+    def __optimize_pipe_node(node):
+        """
+        Flatten the alternation, then remove duplicates and factor common prefixes and suffixes
+
+        :param node: Pipe node
+        :return Optimized node
+        """
+        alternatives = [Optimizer.optimize(a) for a in Optimizer.__flatten(node, PipeNode)]
+
+        return Optimizer.__optimize_alternatives(alternatives)
+
+    @staticmethod
+    def __optimize_alternatives(alternatives: list):
+        """
+        Helper for pipe nodes, works on the already optimized alternatives
+
+        :param alternatives: List of optimized nodes
+        :return Optimized node
+        """
+        alternatives = Optimizer.__deduplicate(alternatives)
+
+        if len(alternatives) > 1:
+            alternatives = Optimizer.__factor(alternatives, prefix=True)
+
+        if len(alternatives) > 1:
+            alternatives = Optimizer.__factor(alternatives, prefix=False)
+
+        return Optimizer.__build(alternatives, PipeNode)
+
+    @staticmethod
+    def __deduplicate(alternatives: list) -> list:
+        """
+        Remove duplicate alternatives (i.e. a|a = a), and those subsumed by a star (i.e. a|a* = a*)
+
+        :param alternatives: List of nodes
+        :return List of nodes without duplicates, order is kept
+        """
+        flattened = []
+        for a in alternatives:
+            flattened.extend(Optimizer.__flatten(a, PipeNode))
+
+        stars = {Optimizer.__key(a.literal) for a in flattened if isinstance(a, KleeneNode)}
+        keys_already_seen = set()
+        result = []
+        for a in flattened:
+            key = Optimizer.__key(a)
+            if key in keys_already_seen or key in stars:
+                continue
+
+            keys_already_seen.add(key)
+            result.append(a)
+
+        return result
+
+    @staticmethod
+    def __factor(alternatives: list, prefix: bool) -> list:
+        """
+        Factor the alternatives sharing the same first (or last) factor
+        (i.e. ab|ac = a(b|c), and ac|bc = (a|b)c)
+
+        Only alternatives with at least two factors are grouped, since there is no epsilon node to represent
+        the empty remainder (i.e. ab|a is kept as is)
+
+        :param alternatives: List of nodes
+        :param prefix: True to factor the prefixes, False for the suffixes
+        :return List of nodes
+        """
+        groups = {} # key of shared factor ---> list of sequences of factors
+        order = [] # Keeps the position of the first alternative of each group
+        for a in alternatives:
+            factors = Optimizer.__flatten(a, ConcatNode)
+            if len(factors) < 2:
+                order.append(a)
+                continue
+
+            key = Optimizer.__key(factors[0] if prefix else factors[-1])
+            if key not in groups:
+                groups[key] = []
+                order.append(key)
+
+            groups[key].append(factors)
+
+        result = []
+        for entry in order:
+            if not isinstance(entry, str):
+                result.append(entry)
+                continue
+
+            group = groups[entry]
+            if len(group) == 1:
+                result.append(Optimizer.__build(group[0], ConcatNode))
+                continue
+
+            if prefix:
+                rest = Optimizer.__optimize_alternatives([Optimizer.__build(f[1:], ConcatNode) for f in group])
+                result.append(Optimizer.__optimize_concat_node(ConcatNode(group[0][0], rest)))
+            else:
+                rest = Optimizer.__optimize_alternatives([Optimizer.__build(f[:-1], ConcatNode) for f in group])
+                result.append(Optimizer.__optimize_concat_node(ConcatNode(rest, group[0][-1])))
+
+        return result
+
+    @staticmethod
+    def __flatten(node, node_type) -> list:
+        """
+        Flatten nested nodes of the same type into a list of operands
+        (i.e. Concat(a, Concat(b, c)) ---> [a, b, c])
+
+        :param node: Some node
+        :param node_type: ConcatNode or PipeNode
+        :return List of operands
+        """
+        if not isinstance(node, node_type):
+            return [node]
+
+        return Optimizer.__flatten(node.left, node_type) + Optimizer.__flatten(node.right, node_type)
+
+    @staticmethod
+    def __build(operands: list, node_type):
+        """
+        Build right-nested nodes from a list of operands, like the parser does
+        (i.e. [a, b, c] ---> Concat(a, Concat(b, c)))
+
+        :param operands: List of nodes
+        :param node_type: ConcatNode or PipeNode
+        :return Node
+        """
+        node = operands[-1]
+        for operand in reversed(operands[:-1]):
+            node = node_type(operand, node)
+
+        return node
+
+    @staticmethod
+    def __key(node) -> str:
+        """
+        Structural key of a node, two nodes with the same key are the same subtree
+
+        :param node: Some node
+        :return Key
+        """
+        return repr(node)
@@ -0,0 +1,272 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from core.pattern import Pattern
+from core.regex import Regex
+
+
+class ParallelMatcher:
+    """
+    ParallelMatcher runs the DFA of a pattern over one huge text with several worker processes
+
+    The text is split into chunks, each worker computes the mapping (state at the start of its chunk ---> state at the end).
+    The start states are speculated: the worker runs the few characters before its chunk from every state,
+    only the distinct states reached can be the real start state, so the mapping stays exact and usually has a single entry.
+    The mappings are then composed in order, which gives the same final state as a sequential scan
+
+    A second pass (see `accepting_positions`) runs each chunk again from its now known start state
+    """
+    # Texts smaller than this are scanned in the current process
+    PARALLEL_THRESHOLD = 1 << 20
+    # Number of characters before a chunk used to narrow its possible start states
+    LOOKBACK = 64
+    # Number of characters run from each distinct state before checking if the states converged
+    BLOCK_SIZE = 1 << 14
+
+    # Transitions of the pattern in the worker processes (see `init_worker`)
+    transitions = {}
+    dead_state = None
+    final_states = frozenset()
+    all_states = ()
+    init_state = 0
+
+    def __init__(self, pattern: Pattern, workers: int = None) -> None:
+        """
+        Initialize the matcher
+
+        :param pattern: Compiled pattern (see `Regex.compile`), rebuilt as a DFA if needed (see `Regex.compile_dfa`)
+        :param workers: Number of worker processes (default: all cores)
+        """
+        pattern = Regex.compile_dfa(pattern)
+        self.pattern = pattern
+        self.workers = workers or os.cpu_count() or 1
+        self.dead_state = len(pattern.states)
+
+    def run(self, text: str) -> int:
+        """
+        Final state of the DFA after the whole text
+
+        :param text: A text
+        :return Final state (`dead_state` if the DFA got stuck)
+        """
+        chunks = self.__split(len(text))
+        if len(chunks) == 1:
+            ParallelMatcher.init_worker(self.pattern)
+            return ParallelMatcher.run_block(self.pattern.init_state, text)
+
+        with self.__executor() as executor:
+            mappings = executor.map(ParallelMatcher.chunk_mapping, (
+                (text[start:end], text[max(0, start - ParallelMatcher.LOOKBACK):start], start == 0)
+                for start, end in chunks
+            ))
+
+            return self.__compose(mappings)
+
+    def match(self, text: str) -> bool:
+        """
+        Tells if the text respect the pattern, same result as `Pattern.match`
+
+        :param text: A text
+        :return True if the text match the pattern, False otherwise
+        """
+        return self.run(text) in self.pattern.final_states
+
+    def match_file(self, path: str) -> bool:
+        """
+        Tells if the content of an UTF-8 file respect the pattern,
+        workers read their chunk themselves so the file is never loaded by the current process
+
+        :param path: Path of the file
+        :return True if the file match the pattern, False otherwise
+        """
+        size = os.path.getsize(path)
+        chunks = self.__split(size)
+        if len(chunks) == 1:
+            # No newline translation, so the text is the same as the one the workers decode
+            with open(path, encoding='utf-8', newline='') as f:
+                return self.match(f.read())
+
+        # Moves each boundary to the start of an UTF-8 character
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            boundaries = [0]
+            for start, _ in chunks[1:]:
+                while start < size and mm[start] & 0xC0 == 0x80:
+                    start += 1
+
+                boundaries.append(start)
+            boundaries.append(size)
+
+        with self.__executor() as executor:
+            mappings = executor.map(ParallelMatcher.file_chunk_mapping, (
+                (path, start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end
+            ))
+
+            return self.__compose(mappings) in self.pattern.final_states
+
+    def accepting_positions(self, text: str) -> list:
+        """
+        Positions where the prefix of the text respect the pattern (i.e. `p` such that text[:p] match)
+
+        :param text: A text
+        :return Sorted list of positions
+        """
+        chunks = self.__split(len(text))
+        if len(chunks) == 1:
+            ParallelMatcher.init_worker(self.pattern)
+            return ParallelMatcher.chunk_positions((self.pattern.init_state, text, 0))
+
+        with self.__executor() as executor:
+            mappings = list(executor.map(ParallelMatcher.chunk_mapping, (
+                (text[start:end], text[max(0, start - ParallelMatcher.LOOKBACK):start], start == 0)
+                for start, end in chunks
+            )))
+
+            # The start state of each chunk is the end state of the previous ones
+            start_states = []
+            state = self.pattern.init_state
+            for mapping in mappings:
+                start_states.append(state)
+                state = mapping.get(state, self.dead_state)
+
+            positions = []
+            for p in executor.map(ParallelMatcher.chunk_positions, (
+                (state, text[start:end], start) for state, (start, end) in zip(start_states, chunks) if state != self.dead_state
+            )):
+                positions.extend(p)
+
+        return positions
+
+    @staticmethod
+    def init_worker(pattern: Pattern) -> None:
+        """
+        Keep the transitions of the pattern for the current process
+
+        :param pattern: Compiled pattern
+        :return None
+        """
+        ParallelMatcher.transitions = pattern.transitions
+        ParallelMatcher.dead_state = len(pattern.states)
+        ParallelMatcher.final_states = pattern.final_states
+        ParallelMatcher.all_states = tuple(sorted(pattern.states))
+        ParallelMatcher.init_state = pattern.init_state
+
+    @staticmethod
+    def run_block(state: int, block: str) -> int:
+        """
+        Run the DFA over a block from a state
+
+        :param state: Start state
+        :param block: A text
+        :return End state (the dead state if the DFA got stuck)
+        """
+        transitions = ParallelMatcher.transitions
+        for c in block:
+            state = transitions.get((state, c))
+            if state is None:
+                return ParallelMatcher.dead_state
+
+        return state
+
+    @staticmethod
+    def chunk_mapping(args: tuple) -> dict:
+        """
+        Mapping (start state ---> end state) of a chunk
+
+        :param args: (chunk, characters before the chunk, True for the first chunk)
+        :return Dictionary start state ---> end state, dead start states are left out
+        """
+        chunk, lookback, first = args
+        if first:
+            starts = {ParallelMatcher.init_state}
+        else:
+            # The real start state is one of the states reached after the lookback from any state
+            starts = {ParallelMatcher.run_block(s, lookback) for s in ParallelMatcher.all_states}
+            starts.discard(ParallelMatcher.dead_state)
+
+        mapping = {s: s for s in starts}
+        for i in range(0, len(chunk), ParallelMatcher.BLOCK_SIZE):
+            block = chunk[i:i + ParallelMatcher.BLOCK_SIZE]
+
+            # States that converged are run only once
+            ends = {s: ParallelMatcher.run_block(s, block) for s in set(mapping.values()) if s != ParallelMatcher.dead_state}
+            mapping = {s: ends.get(e, ParallelMatcher.dead_state) for s, e in mapping.items()}
+
+        return mapping
+
+    @staticmethod
+    def file_chunk_mapping(args: tuple) -> dict:
+        """
+        Mapping (start state ---> end state) of a chunk of an UTF-8 file
+
+        :param args: (path, start offset, end offset), both offsets are at the start of a character
+        :return Dictionary start state ---> end state, dead start states are left out
+        """
+        path, start, end = args
+        lookback_start = max(0, start - ParallelMatcher.LOOKBACK * 4)
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # The lookback may start in the middle of a character
+            while lookback_start < start and mm[lookback_start] & 0xC0 == 0x80:
+                lookback_start += 1
+
+            lookback = mm[lookback_start:start].decode('utf-8')
+            chunk = mm[start:end].decode('utf-8')
+
+        return ParallelMatcher.chunk_mapping((chunk, lookback, start == 0))
+
+    @staticmethod
+    def chunk_positions(args: tuple) -> list:
+        """
+        Positions in a chunk where the DFA is in a final state
+
+        :param args: (start state, chunk, offset of the chunk in the text)
+        :return List of positions
+        """
+        state, chunk, offset = args
+        transitions = ParallelMatcher.transitions
+        final_states = ParallelMatcher.final_states
+        positions = [offset] if offset == 0 and state in final_states else []
+        for i, c in enumerate(chunk, offset + 1):
+            state = transitions.get((state, c))
+            if state is None:
+                break
+
+            if state in final_states:
+                positions.append(i)
+
+        return positions
+
+    def __compose(self, mappings) -> int:
+        """
+        Compose the mappings of the chunks in order
+
+        :param mappings: Iterable of dictionaries start state ---> end state
+        :return Final state
+        """
+        state = self.pattern.init_state
+        for mapping in mappings:
+            state = mapping.get(state, self.dead_state)
+
+        return state
+
+    def __split(self, length: int) -> list:
+        """
+        Split a text into one chunk per worker
+
+        :param length: Length of the text
+        :return List of (start, end)
+        """
+        if self.workers <= 1 or length < ParallelMatcher.PARALLEL_THRESHOLD:
+            return [(0, length)]
+
+        size = -(-length // self.workers)
+
+        return [(start, min(start + size, length)) for start in range(0, length, size)]
+
+    def __executor(self) -> ProcessPoolExecutor:
+        """
+        Pool of workers holding the transitions of the pattern
+
+        :return Executor
+        """
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=ParallelMatcher.init_worker, initargs=(self.pattern,))
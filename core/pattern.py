@@ -0,0 +1,211 @@
+from core.automaton import Automaton
+
+
+class Pattern:
+    """
+    Pattern is a compiled regular expression, it holds the deterministic automaton
+    in a form ready for matching
+
+    At compile time we precompute:
+        (1) Dead states: states from which no final state can be reached, transitions to them are dropped
+            so the matching stops on the first missing (state, symbol)
+        (2) Accepting sinks: final states where every symbol of the alphabet has a transition
+            and every state reached from them is also an accepting sink,
+            once we are in such state the outcome depends only on the remaining symbols being in the alphabet
+    """
+    def __init__(self, regex: str, automaton: Automaton) -> None:
+        """
+        Initialize the compiled pattern from a DFA
+
+        :param regex: Pattern
+        :param automaton: Deterministic automaton recognizing the pattern
+        """
+        self.regex = regex
+        self.alphabet = frozenset(automaton.alphabet)
+
+        # We give new names to the reachable states (i.e. 0, 1, 2, ...) the initial state is always 0
+        init_state = next(iter(automaton.init_states))
+        name_mapper = {init_state: 0}
+        states_needs_processing = [init_state]
+        transitions = {}
+        while len(states_needs_processing) > 0:
+            state = states_needs_processing.pop()
+            for symbol in sorted(self.alphabet):
+                if (state, symbol) not in automaton.transitions:
+                    continue
+
+                target = next(iter(automaton.transitions[(state, symbol)]))
+                if target not in name_mapper:
+                    name_mapper[target] = len(name_mapper)
+                    states_needs_processing.append(target)
+
+                transitions[(name_mapper[state], symbol)] = name_mapper[target]
+
+        self.init_state = 0
+        self.states = frozenset(name_mapper.values())
+        self.final_states = frozenset(name_mapper[s] for s in automaton.final_states if s in name_mapper)
+        self.dead_states = Pattern.__find_dead_states(self.states, self.final_states, transitions)
+
+        # Transitions to dead states behave like missing transitions
+        self.transitions = {k: v for k, v in transitions.items() if k[0] not in self.dead_states and v not in self.dead_states}
+        self.sink_states = Pattern.__find_sink_states(self.alphabet, self.final_states, self.transitions)
+
+    def match(self, literal: str) -> bool:
+        """
+        Tells if the literal respect the pattern
+
+        :param literal: A text
+        :return True if the literal match the pattern, False otherwise
+        """
+        transitions = self.transitions
+        state = self.init_state
+        if state in self.dead_states:
+            return False
+
+        if len(self.sink_states) == 0:
+            for c in literal:
+                state = transitions.get((state, c))
+                if state is None: # Missing symbol or dead state, no way back to a final state
+                    return False
+
+            return state in self.final_states
+
+        sink_states = self.sink_states
+        for i, c in enumerate(literal):
+            if state in sink_states: # Every continuation over the alphabet is accepted
+                return self.alphabet.issuperset(literal[i:])
+
+            state = transitions.get((state, c))
+            if state is None:
+                return False
+
+        return state in self.final_states
+
+    def match_stream(self, chunks) -> bool:
+        """
+        Tells if the concatenation of the chunks respect the pattern,
+        chunks are consumed one by one, and the reading stops on a dead state
+
+        :param chunks: Iterable of strings (e.g. file opened in text mode)
+        :return True if the text match the pattern, False otherwise
+        """
+        transitions = self.transitions
+        sink_states = self.sink_states
+        state = self.init_state
+        if state in self.dead_states:
+            return False
+
+        chunks = iter(chunks)
+        for chunk in chunks:
+            for i, c in enumerate(chunk):
+                if state in sink_states:
+                    # Only the membership of the remaining symbols to the alphabet matters
+                    if not self.alphabet.issuperset(chunk[i:]):
+                        return False
+
+                    return all(self.alphabet.issuperset(rest) for rest in chunks)
+
+                state = transitions.get((state, c))
+                if state is None:
+                    return False
+
+        return state in self.final_states
+
+    def search(self, literal: str) -> bool:
+        """
+        Tells if some substring of the literal respect the pattern,
+        the search stops on the first final state reached
+
+        :param literal: A text
+        :return True if a substring match the pattern, False otherwise
+        """
+        transitions = self.transitions
+        final_states = self.final_states
+        init_state = self.init_state
+        if init_state in final_states:
+            return True
+
+        if init_state in self.dead_states:
+            return False
+
+        # Each state is the progress of a match started at some earlier position
+        # the matches that reach a dead state are dropped
+        states = set()
+        for c in literal:
+            states.add(init_state)
+            next_states = set()
+            for state in states:
+                state = transitions.get((state, c))
+                if state is not None:
+                    if state in final_states:
+                        return True
+
+                    next_states.add(state)
+
+            states = next_states
+
+        return False
+
+    def dense_table(self) -> tuple:
+        """
+        Dense form of the transitions, the symbols are numbered in sorted order
+        and one extra state (i.e. len(self.states)) stands for the dead state
+
+        :return (symbols, table) where table[state][i] is the state reached from state with symbols[i]
+        """
+        symbols = sorted(self.alphabet)
+        dead_state = len(self.states)
+        table = [[self.transitions.get((state, symbol), dead_state) for symbol in symbols] for state in range(dead_state)]
+        table.append([dead_state] * len(symbols))
+
+        return symbols, table
+
+    @staticmethod
+    def __find_dead_states(states: frozenset, final_states: frozenset, transitions: dict) -> frozenset:
+        """
+        Get all states from which no final state can be reached
+
+        :param states: Set of states
+        :param final_states: Set of final states
+        :param transitions: Transitions (state, symbol) ---> state
+        :return Set of dead states
+        """
+        predecessors = {}
+        for (state, symbol), target in transitions.items():
+            predecessors.setdefault(target, set()).add(state)
+
+        # Going backward from the final states
+        alive_states = set(final_states)
+        states_needs_processing = list(final_states)
+        while len(states_needs_processing) > 0:
+            state = states_needs_processing.pop()
+            for s in predecessors.get(state, ()):
+                if s not in alive_states:
+                    alive_states.add(s)
+                    states_needs_processing.append(s)
+
+        return frozenset(states - alive_states)
+
+    @staticmethod
+    def __find_sink_states(alphabet: frozenset, final_states: frozenset, transitions: dict) -> frozenset:
+        """
+        Get all accepting sinks, final states with a transition for every symbol
+        and whose successors are accepting sinks too
+
+        :param alphabet: Symbols knows by the automaton
+        :param final_states: Set of final states
+        :param transitions: Transitions (state, symbol) ---> state, without dead states
+        :return Set of accepting sinks
+        """
+        sink_states = {s for s in final_states if all((s, symbol) in transitions for symbol in alphabet)}
+
+        # We remove candidates until every successor of a candidate is a candidate
+        changed = True
+        while changed:
+            changed = False
+            for s in list(sink_states):
+                if any(transitions[(s, symbol)] not in sink_states for symbol in alphabet):
+                    sink_states.remove(s)
+                    changed = True
+
+        return frozenset(sink_states)
@@ -0,0 +1,253 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core.pattern import Pattern
+from core.regex import Regex
+
+
+class PatternSetSnapshot:
+    """
+    PatternSetSnapshot is an immutable version of a pattern set
+
+    Each pattern keeps its own DFA (i.e. a shard), the combined automaton is the product of the shards
+    and it is determinized lazily: a combined state (the tuple of the shard states) and its transitions
+    are only built the first time the matching goes through them.
+    Adding or removing a pattern builds a new snapshot that reuses the compiled shards,
+    but every combined state built so far is thrown away, the new snapshot starts from its initial state only.
+
+    The combined states are bounded: once MAX_STATES are built, the lazy tables are thrown away
+    and the matching restarts from the state reached (like lazy DFA engines flushing their cache).
+    A flush replaces the tables instead of clearing them, so a concurrent matching keeps using the ones it started with
+    """
+    DEAD_STATE = -1
+    # Maximum number of combined states built before the lazy tables are thrown away
+    MAX_STATES = 10000
+
+    def __init__(self, patterns: dict) -> None:
+        """
+        Initialize the snapshot
+
+        :param patterns: Dictionary id ---> compiled pattern
+        """
+        self.patterns = dict(patterns)
+        self.ids = tuple(sorted(self.patterns))
+        self.__shards = tuple(self.patterns[i] for i in self.ids)
+        self.__lock = threading.Lock() # Only taken when a new combined state is built
+        self.flushes = 0 # Number of times the lazy tables were thrown away
+        self.init_state = 0
+        self.__tables = self.__new_tables()
+
+    def add(self, id: int, pattern: Pattern) -> 'PatternSetSnapshot':
+        """
+        New snapshot with one more pattern
+
+        :param id: Id of the pattern
+        :param pattern: Compiled pattern
+        :return New snapshot
+        """
+        return PatternSetSnapshot({**self.patterns, id: pattern})
+
+    def remove(self, id: int) -> 'PatternSetSnapshot':
+        """
+        New snapshot without a pattern
+
+        :param id: Id of the pattern
+        :return New snapshot
+        :raise KeyError in case the id is unknown
+        """
+        patterns = dict(self.patterns)
+        del patterns[id]
+
+        return PatternSetSnapshot(patterns)
+
+    def match(self, literal: str) -> frozenset:
+        """
+        Tells which patterns the literal respects
+
+        :param literal: A text
+        :return Set of ids of the matching patterns
+        """
+        tables = self.__tables
+        transitions = tables[3]
+        state = self.init_state
+        for c in literal:
+            next_state = transitions.get((state, c))
+            if next_state is None:
+                # May come back with new tables after a flush, the state reached is then numbered in them
+                tables, next_state = self.__expand(tables, state, c)
+                transitions = tables[3]
+
+            if next_state == PatternSetSnapshot.DEAD_STATE: # Every shard is in a dead state
+                return frozenset()
+
+            state = next_state
+
+        return tables[2][state]
+
+    def size(self) -> int:
+        """
+        Number of combined states built so far (since the last flush)
+
+        :return Number of states
+        """
+        return len(self.__tables[1])
+
+    def __new_tables(self) -> tuple:
+        """
+        Empty lazy tables, holding the initial combined state only
+
+        :return (Tuple of shard states ---> combined state, combined state ---> tuple of shard states,
+                 combined state ---> ids of the patterns accepting in it, (combined state, symbol) ---> combined state)
+        """
+        tables = ({}, [], [], {})
+        self.__state_of(tables, tuple(s.init_state for s in self.__shards))
+
+        return tables
+
+    def __expand(self, tables: tuple, state: int, symbol: str) -> tuple:
+        """
+        Build the transition of a combined state on a symbol, flush the tables when they are full
+
+        :param tables: Lazy tables the state belongs to
+        :param state: Combined state
+        :param symbol: Some symbol
+        :return (Lazy tables the combined state reached belongs to, combined state reached)
+        """
+        shard_states = []
+        for shard, s in zip(self.__shards, tables[1][state]):
+            shard_states.append(None if s is None else shard.transitions.get((s, symbol)))
+
+        shard_states = tuple(shard_states)
+        if all(s is None for s in shard_states):
+            tables[3][(state, symbol)] = PatternSetSnapshot.DEAD_STATE
+            return tables, PatternSetSnapshot.DEAD_STATE
+
+        with self.__lock:
+            if shard_states not in tables[0] and len(tables[1]) >= PatternSetSnapshot.MAX_STATES:
+                if tables is self.__tables: # Not flushed yet by another thread
+                    self.__tables = self.__new_tables()
+                    self.flushes += 1
+
+                next_tables = self.__tables
+            else:
+                next_tables = tables
+
+            next_state = self.__state_of(next_tables, shard_states)
+            if next_tables is tables:
+                tables[3][(state, symbol)] = next_state
+
+        return next_tables, next_state
+
+    def __state_of(self, tables: tuple, shard_states: tuple) -> int:
+        """
+        Get the combined state of a tuple of shard states, create it if needed (the lock must be held)
+
+        :param tables: Lazy tables
+        :param shard_states: Tuple of shard states (None for a dead shard)
+        :return Combined state
+        """
+        name_mapper, states, accepting, _ = tables
+        if shard_states not in name_mapper:
+            accepting.append(frozenset(
+                i for i, shard, s in zip(self.ids, self.__shards, shard_states) if s is not None and s in shard.final_states
+            ))
+            states.append(shard_states)
+            name_mapper[shard_states] = len(states) - 1
+
+        return name_mapper[shard_states]
+
+
+class PatternSet:
+    """
+    PatternSet is a mutable set of patterns, that can be updated without recompiling the whole set
+
+    Only the added pattern is compiled, the matching keeps using the current snapshot
+    until the new one is ready, then the new snapshot is swapped in atomically (i.e. one reference assignment)
+    """
+    def __init__(self, regexes: list = None) -> None:
+        """
+        Initialize the set
+
+        :param regexes: Initial patterns
+        """
+        self.__lock = threading.Lock() # Serializes the updates, never taken by the matching
+        self.__next_id = 0
+        self.__snapshot = PatternSetSnapshot({})
+        self.__executor = None
+
+        for regex in regexes or []:
+            self.add(regex)
+
+    def add(self, regex: str) -> int:
+        """
+        Add a pattern to the set
+
+        :param regex: Pattern
+        :return Id of the pattern
+        :raise SyntaxError in case the pattern is not valid
+        """
+        pattern = Regex.compile(regex, engine='dfa') # The costly part, done while the current snapshot keeps serving
+
+        with self.__lock:
+            id = self.__next_id
+            self.__next_id += 1
+            self.__snapshot = self.__snapshot.add(id, pattern)
+
+        return id
+
+    def add_in_background(self, regex: str) -> Future:
+        """
+        Add a pattern to the set from a background thread
+
+        :param regex: Pattern
+        :return Future of the id of the pattern
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chameleon-pattern-set')
+
+        return self.__executor.submit(self.add, regex)
+
+    def remove(self, id: int) -> None:
+        """
+        Remove a pattern from the set
+
+        :param id: Id of the pattern
+        :return None
+        :raise KeyError in case the id is unknown
+        """
+        with self.__lock:
+            self.__snapshot = self.__snapshot.remove(id)
+
+    def match(self, literal: str) -> frozenset:
+        """
+        Tells which patterns the literal respects
+
+        :param literal: A text
+        :return Set of ids of the matching patterns
+        """
+        return self.__snapshot.match(literal)
+
+    def snapshot(self) -> PatternSetSnapshot:
+        """
+        Current version of the set, it never changes even if the set is updated
+
+        :return Snapshot
+        """
+        return self.__snapshot
+
+    def __len__(self) -> int:
+        """
+        Number of patterns in the set
+
+        :return Number of patterns
+        """
+        return len(self.__snapshot.patterns)
+
+    def __contains__(self, id: int) -> bool:
+        """
+        Checks if a pattern id is in the set
+
+        :return True if the id is in the set
+        """
+        return id in self.__snapshot.patterns
@@ -1,12 +1,17 @@
-from copy import copy
+import threading
 
+from core.analyzer import CostAnalyzer
 from core.automaton import Automaton
+from core.bitparallel import BitParallelPattern
 from core.lexer.lexer import Lexer
+from core.limits import CompileLimits
+from core.optimizer.optimizer import Optimizer
 from core.parser.parser import Parser
 from core.parser.tree.concat_node import ConcatNode
 from core.parser.tree.kleen_node import KleeneNode
 from core.parser.tree.literal_node import LiteralNode
 from core.parser.tree.pipe_node import PipeNode
+from core.pattern import Pattern
 
 
 class Regex:
@@ -14,6 +19,7 @@ class Regex:
     Regex class encapsulate all methods that helps runs and evaluates regular expression
     """
     state = 0
+    lock = threading.Lock() # The parser and the Thompson construction share class-level state
     @staticmethod
     def match(literal: str, regex: str) -> bool:
         """
@@ -23,58 +29,120 @@ class Regex:
         :param regex: Regular Expression
         :return True if the literal match the regex, False otherwise
         """
+        return Regex.compile(regex).match(literal)
 
-        automaton_DFA = Regex.__construct_automaton(regex) # Make a deterministic state machine
-        state = next(iter(automaton_DFA.init_states)) # The entry to the state machine
+    @staticmethod
+    def search(literal: str, regex: str) -> bool:
+        """
+        Tells if some substring of the literal respect a certain pattern (i.e. regex)
 
-        # We loop over each character in literal
-        # if the character is not in the definition of alphabet of the automaton we simply return False
-        # else we goto other state, and we keep doing that unit we reach the end of literal
-        # Final step we check if the current state is the final state if so we return True otherwise False
-        for c in literal:
-            if c not in automaton_DFA.alphabet:
-                return False
+        :param literal: A text
+        :param regex: Regular Expression
+        :return True if a substring of the literal match the regex, False otherwise
+        """
+        return Regex.compile(regex).search(literal)
 
-            if (state, c) not in automaton_DFA.transitions:
-                return False
+    @staticmethod
+    def compile(regex: str, engine: str = 'auto', limits: CompileLimits = None):
+        """
+        Compile the regex once, so it can be matched against many literals
 
-            state = Regex.__goto(automaton_DFA.transitions, state, c).pop()
+        :param regex: Regular Expression
+        :param engine: `dfa` for a deterministic automaton, `bitparallel` for a bit-parallel position automaton,
+                       or `auto` to use the bit-parallel one when the pattern is small enough (i.e. no determinization cost)
+        :param limits: Compile limits for the DFA (e.g. untrusted patterns), None for no limit
+        :return Compiled pattern (Pattern or BitParallelPattern), both have match, match_stream and search
+        :raise Exception for unknown engine
+        :raise CompileLimitExceeded in case the estimated or the actual automaton exceeds the limits
+        """
+        if engine not in ('auto', 'dfa', 'bitparallel'):
+            raise Exception(f'Unknown engine {engine}')
 
+        ast_tree = Regex.parse(regex)
 
-        return state in automaton_DFA.final_states
+        if engine == 'bitparallel' or (engine == 'auto' and BitParallelPattern.count_positions(ast_tree) <= BitParallelPattern.MAX_POSITIONS):
+            return BitParallelPattern(regex, ast_tree)
+
+        if limits is None:
+            return Pattern(regex, Regex.__construct_eNFA_from_ast(ast_tree).NFA_to_DFA())
+
+        # Admission control, the pattern is rejected before any automaton is built
+        budget = limits.start()
+        CostAnalyzer.admit(CostAnalyzer.estimate(Lexer.tokenize(regex), ast_tree), limits)
+
+        automaton = Regex.__construct_eNFA_from_ast(ast_tree)
+        budget.check(len(automaton.states), len(automaton.transitions))
+
+        return Pattern(regex, automaton.NFA_to_DFA(budget))
 
     @staticmethod
-    def __goto(transitions, state, symbol) -> set:
+    def compile_dfa(pattern) -> Pattern:
         """
-        Goto from one state to another one based on symbol
+        DFA of a compiled pattern, for the tools that read its tables (e.g. BatchMatcher, CompressedTable)
 
-        :param transitions: Set of transitions
-        :param state: A state
-        :param symbol: Symbol from alphabet
-        :return Set of state
+        :param pattern: Compiled pattern (Pattern or BitParallelPattern)
+        :return The pattern itself if it is already a DFA, its DFA otherwise
         """
-        return copy(transitions[(state, symbol)])
+        if isinstance(pattern, Pattern):
+            return pattern
+
+        return Regex.compile(pattern.regex, engine='dfa')
 
     @staticmethod
-    def __construct_automaton(regex: str) -> Automaton:
+    def estimate(regex: str) -> dict:
+        """
+        Estimate the cost of compiling the regex, without building any automaton
+
+        :param regex: Regular Expression
+        :return Dictionary of estimates (see `CostAnalyzer.estimate`)
         """
-        Construct a deterministic automaton based on regex
+        return CostAnalyzer.estimate(Lexer.tokenize(regex), Regex.parse(regex))
+
+    @staticmethod
+    def parse(regex: str, optimize: bool = True):
+        """
+        Build the Abstract Syntax Tree based on regex
 
         :param regex: Pattern
-        :return Automaton
+        :param optimize: Rewrite the AST with the optimizer
+        :return Abstract Syntax Tree
         """
         # Lexing phase of the regex expression
         tokens = Lexer.tokenize(regex)
 
         # Parsing phase
-        ast_tree = Parser.parse(tokens)
+        with Regex.lock:
+            ast_tree = Parser.parse(tokens)
+
+        # Optimization phase, removes the redundant forms (e.g. (a*)*, a|a, ab|ac)
+        if optimize:
+            ast_tree = Optimizer.optimize(ast_tree)
+
+        return ast_tree
+
+    @staticmethod
+    def construct_eNFA(regex: str, optimize: bool = True) -> Automaton:
+        """
+        Construct the Thompson automaton (i.e. epsilon-NFA) based on regex
 
-        Regex.state = 0
+        :param regex: Pattern
+        :param optimize: Rewrite the AST with the optimizer before the construction
+        :return Epsilon-NFA
+        """
+        return Regex.__construct_eNFA_from_ast(Regex.parse(regex, optimize))
+
+    @staticmethod
+    def __construct_eNFA_from_ast(ast_tree) -> Automaton:
+        """
+        Construct the Thompson automaton (i.e. epsilon-NFA) based on abstract syntax tree
 
-        # Construct Thompson automaton based on abstract syntax tree
-        automaton = Regex.__construct_automaton_from_ast_nodes(ast_tree)
+        :param ast_tree: Abstract Syntax Tree
+        :return Epsilon-NFA
+        """
+        with Regex.lock:
+            Regex.state = 0
 
-        return automaton.NFA_to_DFA()
+            return Regex.__construct_automaton_from_ast_nodes(ast_tree)
 
     @staticmethod
     def __construct_automaton_from_ast_nodes(node) -> Automaton:
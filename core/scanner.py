@@ -0,0 +1,117 @@
+from core.regex import Regex
+
+
+class Scanner:
+    """
+    Scanner is a tokenizer generated from an ordered list of rules (token name, pattern)
+
+    All the rules are combined into one DFA (i.e. the product of the DFA of each rule),
+    a combined state accepts the first rule, in the order given, that accepts in it.
+    The input is tokenized left to right with longest-match semantics (i.e. maximal munch):
+    the DFA runs until it gets stuck, then the last accepting position found gives the token
+    """
+    def __init__(self, rules: list) -> None:
+        """
+        Build the combined DFA
+
+        :param rules: Ordered list of (token name, pattern), earlier rules win ties
+        :raise SyntaxError in case a pattern is not valid
+        """
+        self.names = [name for name, _ in rules]
+        patterns = [Regex.compile(regex, engine='dfa') for _, regex in rules]
+        alphabet = sorted(set().union(*(p.alphabet for p in patterns)))
+
+        init_state = tuple(p.init_state for p in patterns)
+        name_mapper = {init_state: 0}
+        states_needs_processing = [init_state]
+        self.transitions = {} # (state, symbol) ---> state, missing transitions lead to the dead state
+        while len(states_needs_processing) > 0:
+            state = states_needs_processing.pop()
+            for symbol in alphabet:
+                next_state = tuple(
+                    None if s is None else p.transitions.get((s, symbol)) for p, s in zip(patterns, state)
+                )
+                if all(s is None for s in next_state):
+                    continue
+
+                if next_state not in name_mapper:
+                    name_mapper[next_state] = len(name_mapper)
+                    states_needs_processing.append(next_state)
+
+                self.transitions[(name_mapper[state], symbol)] = name_mapper[next_state]
+
+        self.accepting = [None] * len(name_mapper) # State ---> token name or None
+        for state, number in name_mapper.items():
+            for name, p, s in zip(self.names, patterns, state):
+                if s is not None and s in p.final_states:
+                    self.accepting[number] = name
+                    break
+
+    def tokenize(self, text: str):
+        """
+        Tokenize a text
+
+        :param text: A text
+        :return Generator of (token name, start, end)
+        :raise SyntaxError in case no rule matches at some position
+        """
+        yield from self.__tokens(text, 0, True)
+
+    def tokenize_stream(self, chunks):
+        """
+        Tokenize a text read chunk by chunk, positions are relative to the whole text,
+        a token that may continue in the next chunk is held back until it is complete
+
+        :param chunks: Iterable of strings (e.g. file opened in text mode)
+        :return Generator of (token name, start, end)
+        :raise SyntaxError in case no rule matches at some position
+        """
+        buffer = ''
+        offset = 0
+        for chunk in chunks:
+            buffer += chunk
+            consumed = yield from self.__tokens(buffer, offset, False)
+            buffer = buffer[consumed:]
+            offset += consumed
+
+        yield from self.__tokens(buffer, offset, True)
+
+    def __tokens(self, text: str, offset: int, final: bool):
+        """
+        Helper for `tokenize` and `tokenize_stream`
+
+        :param text: A text
+        :param offset: Position of the text in the whole input
+        :param final: False if more text may follow, the scanning then stops before a token reaching the end
+        :return Generator of (token name, start, end), its return value is the number of characters consumed
+        :raise SyntaxError in case no rule matches at some position
+        """
+        transitions = self.transitions
+        accepting = self.accepting
+        length = len(text)
+        pos = 0
+        while pos < length:
+            state = 0
+            token_name, token_end = None, pos
+            i = pos
+            while i < length:
+                state = transitions.get((state, text[i]))
+                if state is None:
+                    break
+
+                i += 1
+                if accepting[state] is not None:
+                    token_name, token_end = accepting[state], i
+            else:
+                # The token may continue in the next chunk
+                if not final:
+                    return pos
+
+            # Empty tokens are not produced, they would never advance the position
+            if token_name is None:
+                raise SyntaxError(f'Unexpected `{text[pos]}` at position {offset + pos + 1}')
+
+            yield token_name, offset + pos, offset + token_end
+            pos = token_end
+
+        return pos
@@ -0,0 +1,257 @@
+import mmap
+import os
+from array import array
+from multiprocessing import shared_memory
+
+from core.regex import Regex
+
+
+class SharedPattern:
+    """
+    SharedPattern is a compiled pattern whose transition table lives in a shared block (see `SharedTables`)
+
+    Pickling a shared pattern only transfers the handle of the block and the index of the pattern,
+    the receiving process attaches the block once and reads the table in place
+    """
+    def __init__(self, tables: 'SharedTables', index: int) -> None:
+        """
+        Initialize the pattern from its entry in the block
+
+        Entry layout (unsigned 32-bit words):
+            number of states (dead state included), number of symbols, init state,
+            code point of each symbol, final flag of each state, table (states x symbols)
+
+        :param tables: Attached block
+        :param index: Index of the pattern
+        """
+        words = tables.words
+        offset = words[SharedTables.HEADER + index]
+        number_of_states, number_of_symbols = words[offset], words[offset + 1]
+        symbols_offset = offset + 3
+        finals_offset = symbols_offset + number_of_symbols
+
+        self.tables = tables
+        self.index = index
+        self.regex = tables.regexes[index]
+        self.init_state = words[offset + 2]
+        self.dead_state = number_of_states - 1
+        self.number_of_symbols = number_of_symbols
+        self.table_offset = finals_offset + number_of_states
+        self.symbol_index = {chr(words[symbols_offset + i]): i for i in range(number_of_symbols)}
+        self.final_states = frozenset(s for s in range(number_of_states) if words[finals_offset + s])
+
+    def match(self, literal: str) -> bool:
+        """
+        Tells if the literal respect the pattern
+
+        :param literal: A text
+        :return True if the literal match the pattern, False otherwise
+        """
+        words = self.tables.words
+        symbol_index = self.symbol_index
+        offset = self.table_offset
+        width = self.number_of_symbols
+        dead_state = self.dead_state
+        state = self.init_state
+        for c in literal:
+            i = symbol_index.get(c)
+            if i is None:
+                return False
+
+            state = words[offset + state * width + i]
+            if state == dead_state:
+                return False
+
+        return state in self.final_states
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle only the handle of the block and the index of the pattern
+
+        :return Reconstruction of the pattern
+        """
+        return SharedTables.pattern_from_handle, (self.tables.handle, self.index)
+
+    def __repr__(self) -> str:
+        """
+        Helps in debugging
+
+        :return Formated String
+        """
+        return f"SharedPattern('{self.regex}', handle={self.tables.handle}, index={self.index})"
+
+
+class SharedTables:
+    """
+    SharedTables holds the compiled tables of many patterns in one block of memory,
+    created once by a parent process and attached read-only by the workers
+
+    The block is either a `multiprocessing.shared_memory` segment (i.e. handle ('shm', name))
+    or a memory-mapped file (i.e. handle ('file', path)), a file can also be reused across restarts
+
+    Block layout (unsigned 32-bit words):
+        number of patterns, byte offset of the patterns text, byte length of the patterns text,
+        word offset of each pattern entry, pattern entries (see `SharedPattern`),
+        patterns text (UTF-8, separated by NUL)
+    """
+    HEADER = 3
+
+    # Blocks already attached by the current process, handle ---> tables
+    attached = {}
+
+    def __init__(self, handle: tuple, owner, buffer) -> None:
+        """
+        Initialize from an attached block
+
+        :param handle: ('shm', name) or ('file', path)
+        :param owner: SharedMemory or mmap object that owns the buffer
+        :param buffer: Buffer of the block
+        """
+        self.handle = handle
+        self.owner = owner
+        # Read-only, only the creator writes the block while filling it (see `create`)
+        self.buffer = memoryview(buffer).toreadonly()
+        self.words = self.buffer[:len(self.buffer) // 4 * 4].cast('I')
+
+        count, text_offset, text_length = self.words[0], self.words[1], self.words[2]
+        self.regexes = bytes(self.buffer[text_offset:text_offset + text_length]).decode('utf-8').split('\0') if count > 0 else []
+        self.patterns = [SharedPattern(self, i) for i in range(count)]
+
+    @staticmethod
+    def create(regexes: list, path: str = None) -> 'SharedTables':
+        """
+        Compile the patterns and place their tables in a new shared block
+
+        :param regexes: List of patterns
+        :param path: File to memory-map, a shared memory segment is created if None
+        :return Tables, owned by the current process (see `unlink`)
+        """
+        words = SharedTables.pack(regexes)
+        text = '\0'.join(regexes).encode('utf-8')
+        size = len(words) * 4 + len(text)
+        words[1], words[2] = len(words) * 4, len(text)
+
+        if path is None:
+            owner = shared_memory.SharedMemory(create=True, size=size)
+            owner.buf[:len(words) * 4] = words.tobytes()
+            owner.buf[len(words) * 4:size] = text
+
+            tables = SharedTables(('shm', owner.name), owner, owner.buf)
+        else:
+            with open(path, 'wb') as f:
+                f.write(words.tobytes())
+                f.write(text)
+
+            tables = SharedTables.attach(('file', path))
+
+        SharedTables.attached[tables.handle] = tables
+
+        return tables
+
+    @staticmethod
+    def pack(regexes: list) -> array:
+        """
+        Compile the patterns and lay out the block (the patterns text excluded)
+
+        :param regexes: List of patterns
+        :return Array of unsigned 32-bit words
+        """
+        words = array('I', [len(regexes), 0, 0] + [0] * len(regexes))
+        for i, regex in enumerate(regexes):
+            pattern = Regex.compile(regex, engine='dfa')
+            symbols, table = pattern.dense_table()
+
+            words[SharedTables.HEADER + i] = len(words)
+            words.extend((len(table), len(symbols), pattern.init_state))
+            words.extend(ord(s) for s in symbols)
+            words.extend(1 if s in pattern.final_states else 0 for s in range(len(table)))
+            for row in table:
+                words.extend(row)
+
+        return words
+
+    @staticmethod
+    def attach(handle: tuple) -> 'SharedTables':
+        """
+        Attach an existing block read-only, a block is attached once per process
+
+        :param handle: ('shm', name) or ('file', path)
+        :return Tables
+        :raise Exception for unknown handle
+        """
+        if handle in SharedTables.attached:
+            return SharedTables.attached[handle]
+
+        kind, name = handle
+        if kind == 'shm':
+            try:
+                # Only the creator removes the segment (Python 3.13+)
+                owner = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Workers started by multiprocessing share the resource tracker of the creator, so tracking is harmless,
+                # unrelated processes should use a file handle since their own tracker would remove the segment at exit
+                owner = shared_memory.SharedMemory(name=name)
+            buffer = owner.buf
+        elif kind == 'file':
+            with open(name, 'rb') as f:
+                owner = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = owner
+        else:
+            raise Exception(f'Unknown handle {handle}')
+
+        tables = SharedTables(handle, owner, buffer)
+        SharedTables.attached[handle] = tables
+
+        return tables
+
+    @staticmethod
+    def pattern_from_handle(handle: tuple, index: int) -> SharedPattern:
+        """
+        Rebuild a pickled shared pattern
+
+        :param handle: ('shm', name) or ('file', path)
+        :param index: Index of the pattern
+        :return Shared pattern
+        """
+        return SharedTables.attach(handle).patterns[index]
+
+    def close(self) -> None:
+        """
+        Detach the block from the current process
+
+        :return None
+        """
+        SharedTables.attached.pop(self.handle, None)
+        self.patterns = []
+        self.words.release()
+        self.buffer.release()
+        self.owner.close()
+
+    def unlink(self) -> None:
+        """
+        Detach and remove the block, called once by the creator when the workers are done
+
+        :return None
+        """
+        self.close()
+        if self.handle[0] == 'shm':
+            self.owner.unlink()
+        else:
+            os.remove(self.handle[1])
+
+    def __getitem__(self, index: int) -> SharedPattern:
+        """
+        Get a pattern by index
+
+        :param index: Index of the pattern
+        :return Shared pattern
+        """
+        return self.patterns[index]
+
+    def __len__(self) -> int:
+        """
+        Number of patterns
+
+        :return Number of patterns
+        """
+        return len(self.patterns)